@@ -20,7 +20,7 @@ import unittest
 
 # Import our custom modules
 from eth_price_tracker import ETHPriceTracker
-from eth_technical_analysis import ETHTechnicalAnalysis
+from eth_technical_analysis import ETHTechnicalAnalysis, _sliding_extreme, _lttb_indices
 from eth_investment_advisor import ETHInvestmentAdvisor
 from eth_risk_manager import ETHRiskManager
 from eth_performance_tracker import ETHPerformanceTracker
@@ -151,6 +151,165 @@ class ETHInvestmentScriptTest(unittest.TestCase):
         print(f"Price chart saved to {chart_path}")
         print("Technical analysis tests passed")
     
+    def test_streaming_indicators(self):
+        """Test that incremental indicator updates match a fresh analysis"""
+        print("\nTesting streaming indicator updates...")
+        
+        prices = 2000 + np.cumsum(np.random.default_rng(7).normal(0, 25, 260))
+        timestamps = pd.date_range("2024-01-01", periods=len(prices), freq="D")
+        
+        def price_frame(end, start=0, last_price=None):
+            frame = pd.DataFrame({"timestamp": timestamps[start:end], "price": prices[start:end]})
+            if last_price is not None:
+                frame.loc[frame.index[-1], "price"] = last_price
+            return frame
+        
+        def assert_same_analysis(streamed, fresh):
+            self.assertAlmostEqual(streamed["rsi"], fresh["rsi"], places=6)
+            for key in ("macd_signal", "golden_cross", "death_cross", "recommendation"):
+                self.assertEqual(streamed[key], fresh[key], f"{key} differs from a fresh analysis")
+        
+        # Appending one bar at a time takes the incremental path
+        self.analyzer.analyze_price_data(price_frame(250))
+        for end in range(251, 256):
+            streamed = self.analyzer.analyze_price_data(price_frame(end))
+            self.assertIsNotNone(self.analyzer._stream, "One-bar extension should use the stream")
+            assert_same_analysis(streamed, ETHTechnicalAnalysis().analyze_price_data(price_frame(end)))
+        
+        # update() folds in a single price and matches the full recomputation
+        latest = self.analyzer.update(prices[255])
+        history = prices[:256]
+        self.assertAlmostEqual(latest["rsi"], self.analyzer.calculate_rsi(history), places=6)
+        full_macd = self.analyzer.calculate_macd(history)
+        for key in ("macd_line", "signal_line", "histogram"):
+            self.assertAlmostEqual(latest["macd"][key], full_macd[key], places=6)
+        self.assertEqual(latest["macd"]["signal"], full_macd["signal"])
+        full_ma = self.analyzer.check_moving_averages(history)
+        self.assertAlmostEqual(latest["moving_averages"]["ma_short"], full_ma["ma_short"], places=6)
+        self.assertAlmostEqual(latest["moving_averages"]["ma_long"], full_ma["ma_long"], places=6)
+        self.assertEqual(latest["moving_averages"]["signal"], full_ma["signal"])
+        
+        # A revised last bar is not an extension and falls back to a full pass
+        analyzer = ETHTechnicalAnalysis()
+        analyzer.analyze_price_data(price_frame(250))
+        revised = price_frame(250, last_price=prices[249] * 1.1)
+        assert_same_analysis(analyzer.analyze_price_data(revised),
+                             ETHTechnicalAnalysis().analyze_price_data(revised))
+        self.assertIsNone(analyzer._stream, "Revised bar should not use the stream")
+        
+        # So does a rolling window that drops its oldest bar as it advances
+        analyzer = ETHTechnicalAnalysis()
+        analyzer.analyze_price_data(price_frame(250, start=160))
+        for end in range(251, 254):
+            window = price_frame(end, start=end - 90)
+            assert_same_analysis(analyzer.analyze_price_data(window),
+                                 ETHTechnicalAnalysis().analyze_price_data(window))
+            self.assertIsNone(analyzer._stream, "Rolling window should not use the stream")
+        
+        print("Streaming indicator tests passed")
+    
+    def test_sliding_extreme(self):
+        """Test the O(N) sliding min/max against pandas rolling windows"""
+        print("\nTesting sliding window min/max...")
+        
+        values = np.random.default_rng(11).normal(2000, 50, 103)
+        
+        for width in (1, 2, 7, 21, 103):
+            for dtype in (np.float64, np.float32):
+                series = pd.Series(values.astype(dtype))
+                expected_min = series.rolling(width).min().to_numpy()[width - 1:]
+                expected_max = series.rolling(width).max().to_numpy()[width - 1:]
+                
+                np.testing.assert_array_equal(_sliding_extreme(series.to_numpy(), width, np.minimum), expected_min)
+                np.testing.assert_array_equal(_sliding_extreme(series.to_numpy(), width, np.maximum), expected_max)
+        
+        print("Sliding window min/max tests passed")
+    
+    def test_rsi_multi(self):
+        """Test multi-window RSI against one calculate_rsi call per window"""
+        print("\nTesting multi-window RSI...")
+        
+        prices = 2000 + np.cumsum(np.random.default_rng(3).normal(0, 25, 120))
+        windows = (7, 14, 21, 150)
+        
+        rsi_values = self.analyzer.calculate_rsi_multi(prices, windows)
+        self.assertEqual(set(rsi_values), set(windows), "Every window should get an RSI value")
+        
+        for window in windows:
+            self.assertAlmostEqual(rsi_values[window], self.analyzer.calculate_rsi(prices, window=window),
+                                   msg=f"RSI({window}) differs from calculate_rsi")
+        
+        print("Multi-window RSI tests passed")
+    
+    def test_lttb_downsampling(self):
+        """Test the indices chosen by LTTB chart downsampling"""
+        print("\nTesting LTTB downsampling...")
+        
+        values = 2000 + np.cumsum(np.random.default_rng(5).normal(0, 25, 5000))
+        values[2500] += 1000  # A spike the chart must not lose
+        
+        for target in (3, 10, 500):
+            indices = _lttb_indices(values, target)
+            self.assertEqual(len(indices), target, "Should keep exactly target points")
+            self.assertEqual(indices[0], 0, "First point should be kept")
+            self.assertEqual(indices[-1], len(values) - 1, "Last point should be kept")
+            self.assertTrue(np.all(np.diff(indices) > 0), "Indices should be strictly increasing")
+        self.assertIn(2500, _lttb_indices(values, 500), "Spike should survive downsampling")
+        
+        # Series no longer than the target are returned whole
+        for target in (len(values), len(values) + 1):
+            np.testing.assert_array_equal(_lttb_indices(values, target), np.arange(len(values)))
+        
+        print("LTTB downsampling tests passed")
+    
+    def test_analysis_cache_copies(self):
+        """Test that editing an analysis result does not change later cache hits"""
+        print("\nTesting analysis cache isolation...")
+        
+        prices = 2000 + np.cumsum(np.random.default_rng(13).normal(0, 25, 300))
+        historical_prices = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=len(prices), freq="D"),
+            "price": prices
+        })
+        
+        first = self.analyzer.analyze_price_data(historical_prices)
+        expected = ETHTechnicalAnalysis().analyze_price_data(historical_prices)
+        
+        # Edit the nested lists as well as the top-level keys
+        first["explanation"].append("Edited")
+        first["support_levels"].append(0.0)
+        first["resistance_levels"].clear()
+        first["recommendation"] = "Edited"
+        
+        cached = self.analyzer.analyze_price_data(historical_prices)
+        self.assertIsNot(cached, first)
+        for key in ("explanation", "support_levels", "resistance_levels", "recommendation"):
+            self.assertEqual(cached[key], expected[key], f"Cached {key} was changed by a caller")
+        self.assertIsInstance(cached["explanation"], list)
+        
+        print("Analysis cache isolation tests passed")
+    
+    def test_support_resistance_levels(self):
+        """Test that support/resistance levels are lists the advisor can evaluate"""
+        print("\nTesting support/resistance levels...")
+        
+        # Several swings around the final price give levels on both sides
+        prices = 2000 + 100 * np.sin(np.linspace(0, 10 * np.pi, 300)) + np.random.default_rng(17).normal(0, 2, 300)
+        
+        sr_levels = self.analyzer.identify_support_resistance(prices)
+        for name in ("support", "resistance"):
+            self.assertIsInstance(sr_levels[name], list, f"{name} levels should be a list")
+            self.assertLessEqual(len(sr_levels[name]), 3)
+        self.assertGreater(len(sr_levels["support"]), 1, "Test data should give several support levels")
+        self.assertGreater(len(sr_levels["resistance"]), 1, "Test data should give several resistance levels")
+        self.assertTrue(all(level < prices[-1] for level in sr_levels["support"]))
+        self.assertTrue(all(level > prices[-1] for level in sr_levels["resistance"]))
+        
+        evaluation = self.advisor.evaluate_support_resistance(prices[-1], sr_levels)
+        self.assertIn("signal_strength", evaluation, "Advisor should evaluate the levels")
+        
+        print("Support/resistance level tests passed")
+    
     def test_investment_advisor(self):
         """Test investment advisor functionality"""
         print("\nTesting investment advisor...")
@@ -234,6 +393,43 @@ class ETHInvestmentScriptTest(unittest.TestCase):
         
         print("Risk manager tests passed")
     
+    def test_position_size_batch(self):
+        """Test batch position sizing against the single-trade calculation"""
+        print("\nTesting batch position sizing...")
+        
+        entry_prices = np.array([2000.0, 2000.0, 2000.0])
+        stop_prices = np.array([1000.0, 1900.0, 2100.0])
+        
+        batch = self.risk_manager.calculate_position_size_batch(entry_prices, stop_prices)
+        self.assertEqual(len(batch.position_size_coins), 3, "Batch should size every trade")
+        
+        # Valid trades must match the single-trade path
+        for i in range(2):
+            single = self.risk_manager.calculate_position_size(entry_prices[i], stop_prices[i])
+            self.assertAlmostEqual(batch.position_size_coins[i], single["position_size_coins"])
+            self.assertAlmostEqual(batch.position_size_dollars[i], single["position_size_dollars"])
+        
+        # Second trade hits the exposure cap, third is an invalid long setup
+        self.assertTrue(batch.is_capped[1], "Tight stop should be capped by max exposure")
+        self.assertTrue(np.isnan(batch.position_size_coins[2]), "Invalid trade should be NaN")
+        
+        print("Batch position sizing tests passed")
+    
+    def test_stop_loss_prices_array(self):
+        """Test that the ndarray fast path matches the DataFrame stop-loss path"""
+        print("\nTesting stop-loss with a plain price array...")
+        
+        prices = 2000 + np.cumsum(np.random.default_rng(42).normal(0, 20, 90))
+        historical_prices = pd.DataFrame({"price": prices})
+        
+        from_frame = self.risk_manager.calculate_stop_loss(2000, historical_prices)
+        from_array = ETHRiskManager(portfolio_value=10000).calculate_stop_loss(2000, prices_array=prices)
+        
+        self.assertEqual(from_frame["recommended_method"], from_array["recommended_method"])
+        self.assertAlmostEqual(from_frame["recommended_stop_price"], from_array["recommended_stop_price"])
+        
+        print("Stop-loss price array tests passed")
+    
     def test_performance_tracker(self):
         """Test performance tracker functionality"""
         print("\nTesting performance tracker...")
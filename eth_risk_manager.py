@@ -14,6 +14,39 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
+from collections import OrderedDict
+from typing import NamedTuple
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None  # Optional: fall back to NumPy sliding windows
+
+# Histories longer than this are scanned in float32 for stop-loss calculations
+FLOAT32_HISTORY_LENGTH = 10_000
+
+# Number of price histories whose ATR/support scans are kept in memory
+HISTORY_CACHE_SIZE = 1024
+
+
+def _rolling_min(values, window):
+    """Minimum of every full window of an array (len(values) - window + 1 results)"""
+    if bn is not None:
+        return bn.move_min(values, window)[window - 1:]
+    return np.lib.stride_tricks.sliding_window_view(values, window).min(axis=1)
+
+
+class PositionSizeBatch(NamedTuple):
+    """Position sizing results for a batch of trades, one array element per trade"""
+    position_size_coins: np.ndarray
+    position_size_dollars: np.ndarray
+    risk_amount: float
+    risk_per_coin: np.ndarray
+    actual_risk_amount: np.ndarray
+    portfolio_percentage: np.ndarray
+    max_position_dollars: float
+    is_capped: np.ndarray
+
 
 class ETHRiskManager:
     """Class for managing risk in ETH investments"""
@@ -30,6 +63,14 @@ class ETHRiskManager:
         self.portfolio_value = portfolio_value
         self.max_risk_per_trade = max_risk_per_trade
         self.max_portfolio_exposure = max_portfolio_exposure
+        self._update_risk_limits()
+        
+        # Incremental (Wilder) ATR state, fed bar by bar through update_atr
+        self._atr_state = None
+        self._atr_seed = []
+        
+        # LRU cache of ATR/support scans keyed on a price-history fingerprint
+        self._history_cache = OrderedDict()
     
     def update_portfolio_value(self, portfolio_value):
         """
@@ -39,8 +80,14 @@ class ETHRiskManager:
             portfolio_value (float): New portfolio value in USD
         """
         self.portfolio_value = portfolio_value
+        self._update_risk_limits()
         print(f"Portfolio value updated to ${portfolio_value:.2f}")
     
+    def _update_risk_limits(self):
+        """Cache the dollar risk budget and exposure cap derived from the portfolio value"""
+        self._risk_amount = self.portfolio_value * self.max_risk_per_trade
+        self._max_position_dollars = self.portfolio_value * self.max_portfolio_exposure
+    
     def calculate_position_size(self, entry_price, stop_loss_price):
         """
         Calculate optimal position size based on risk parameters
@@ -53,30 +100,23 @@ class ETHRiskManager:
             dict: Position sizing details
         """
         try:
-            # Calculate risk amount in dollars
-            risk_amount = self.portfolio_value * self.max_risk_per_trade
-            
             # Calculate risk per coin
             if entry_price <= stop_loss_price:
                 print("Error: Entry price must be greater than stop-loss price for long positions")
                 return None
-                
-            risk_per_coin = entry_price - stop_loss_price
-            
-            # Calculate position size in coins
-            position_size_coins = risk_amount / risk_per_coin
             
-            # Calculate position size in dollars
-            position_size_dollars = position_size_coins * entry_price
+            # Size the trade through the batch path as a single-element batch
+            batch = self.calculate_position_size_batch([entry_price], [stop_loss_price])
             
-            # Check if position size exceeds maximum portfolio exposure
-            max_position_dollars = self.portfolio_value * self.max_portfolio_exposure
+            risk_amount = batch.risk_amount
+            max_position_dollars = batch.max_position_dollars
+            risk_per_coin = float(batch.risk_per_coin[0])
+            position_size_coins = float(batch.position_size_coins[0])
+            position_size_dollars = float(batch.position_size_dollars[0])
             
-            if position_size_dollars > max_position_dollars:
-                # Adjust position size to respect maximum exposure
-                position_size_dollars = max_position_dollars
-                position_size_coins = position_size_dollars / entry_price
-                actual_risk_amount = position_size_coins * risk_per_coin
+            if batch.is_capped[0]:
+                # Position size was reduced to respect maximum exposure
+                actual_risk_amount = float(batch.actual_risk_amount[0])
                 actual_risk_percentage = actual_risk_amount / self.portfolio_value
                 
                 explanation = (
@@ -94,15 +134,12 @@ class ETHRiskManager:
                     f"{self.max_portfolio_exposure * 100:.1f}% (${max_position_dollars:.2f})."
                 )
             
-            # Calculate percentage of portfolio
-            portfolio_percentage = position_size_dollars / self.portfolio_value
-            
             result = {
                 "position_size_coins": position_size_coins,
                 "position_size_dollars": position_size_dollars,
                 "risk_amount": risk_amount,
                 "risk_per_coin": risk_per_coin,
-                "portfolio_percentage": portfolio_percentage,
+                "portfolio_percentage": float(batch.portfolio_percentage[0]),
                 "max_position_dollars": max_position_dollars,
                 "explanation": explanation
             }
@@ -113,7 +150,82 @@ class ETHRiskManager:
             print(f"Error calculating position size: {str(e)}")
             return None
     
-    def calculate_stop_loss(self, entry_price, historical_prices=None, atr_multiplier=2.0, fixed_percentage=0.05):
+    def calculate_position_size_batch(self, entry_prices, stop_loss_prices):
+        """
+        Calculate position sizes for many candidate trades at once
+        
+        Same sizing rules as calculate_position_size, applied element-wise with
+        NumPy so backtests and simulations avoid one Python call per trade.
+        Trades whose entry price is not above the stop-loss price come back as NaN.
+        
+        Args:
+            entry_prices (array-like): Entry prices for ETH
+            stop_loss_prices (array-like): Stop-loss prices for ETH
+            
+        Returns:
+            PositionSizeBatch: Position sizing details, one array element per trade
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        stop_loss_prices = np.asarray(stop_loss_prices, dtype=np.float64)
+        
+        # Risk budget and exposure cap are the same for every trade
+        risk_amount = self._risk_amount
+        max_position_dollars = self._max_position_dollars
+        
+        # Risk per coin, with invalid long setups masked out
+        risk_per_coin = entry_prices - stop_loss_prices
+        risk_per_coin = np.where(risk_per_coin > 0, risk_per_coin, np.nan)
+        
+        # Uncapped position size
+        uncapped_dollars = risk_amount / risk_per_coin * entry_prices
+        
+        # Clamp to maximum portfolio exposure; the flag only feeds explanations
+        position_size_dollars = np.minimum(uncapped_dollars, max_position_dollars)
+        position_size_coins = position_size_dollars / entry_prices
+        is_capped = uncapped_dollars > max_position_dollars
+        
+        return PositionSizeBatch(
+            position_size_coins=position_size_coins,
+            position_size_dollars=position_size_dollars,
+            risk_amount=risk_amount,
+            risk_per_coin=risk_per_coin,
+            actual_risk_amount=position_size_coins * risk_per_coin,
+            portfolio_percentage=position_size_dollars / self.portfolio_value,
+            max_position_dollars=max_position_dollars,
+            is_capped=is_capped
+        )
+    
+    def update_atr(self, high, low, close_prev, n=14):
+        """
+        Update the running ATR with one new bar using Wilder smoothing
+        
+        The first n true ranges seed the ATR with their simple mean; after that
+        each bar costs O(1). Once seeded, calculate_stop_loss uses this value
+        instead of recomputing ATR from the full price history.
+        
+        Args:
+            high (float): High price of the new bar
+            low (float): Low price of the new bar
+            close_prev (float): Close price of the previous bar
+            n (int): ATR period (default: 14)
+            
+        Returns:
+            float: Current ATR value, or None while still seeding
+        """
+        true_range = max(high - low, abs(high - close_prev), abs(low - close_prev))
+        
+        if self._atr_state is None:
+            self._atr_seed.append(true_range)
+            if len(self._atr_seed) >= n:
+                self._atr_state = sum(self._atr_seed[-n:]) / n
+                self._atr_seed = []
+        else:
+            self._atr_state = (self._atr_state * (n - 1) + true_range) / n
+        
+        return self._atr_state
+    
+    def calculate_stop_loss(self, entry_price, historical_prices=None, atr_multiplier=2.0, fixed_percentage=0.05, dtype=None,
+                            *, prices_array=None):
         """
         Calculate stop-loss price based on various methods
         
@@ -122,99 +234,17 @@ class ETHRiskManager:
             historical_prices (DataFrame): Historical price data for ATR calculation
             atr_multiplier (float): Multiplier for ATR-based stop-loss
             fixed_percentage (float): Fixed percentage for simple stop-loss
+            dtype (numpy dtype): Float type for the ATR/support scans (default: float32
+                for histories longer than FLOAT32_HISTORY_LENGTH, float64 otherwise)
+            prices_array (ndarray): Historical prices as a plain array; takes precedence
+                over historical_prices and skips pandas entirely (fast path for backtests)
             
         Returns:
             dict: Stop-loss details with multiple methods
         """
         try:
-            results = {
-                "entry_price": entry_price,
-                "methods": {}
-            }
-            
-            # Method 1: Fixed percentage stop-loss
-            fixed_stop = entry_price * (1 - fixed_percentage)
-            fixed_risk = entry_price - fixed_stop
-            fixed_risk_percentage = fixed_risk / entry_price
-            
-            results["methods"]["fixed_percentage"] = {
-                "stop_price": fixed_stop,
-                "risk_amount": fixed_risk,
-                "risk_percentage": fixed_risk_percentage,
-                "explanation": f"Fixed {fixed_percentage * 100:.1f}% stop-loss below entry price"
-            }
-            
-            # Method 2: ATR-based stop-loss (if historical data is available)
-            if historical_prices is not None and not historical_prices.empty and len(historical_prices) >= 14:
-                # Calculate ATR (Average True Range)
-                high = historical_prices["price"].rolling(window=2).max()
-                low = historical_prices["price"].rolling(window=2).min()
-                close = historical_prices["price"]
-                
-                # Calculate True Range
-                tr1 = high - low
-                tr2 = abs(high - close.shift())
-                tr3 = abs(low - close.shift())
-                
-                true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-                atr = true_range.rolling(window=14).mean().iloc[-1]
-                
-                # Calculate ATR-based stop-loss
-                atr_stop = entry_price - (atr * atr_multiplier)
-                atr_risk = entry_price - atr_stop
-                atr_risk_percentage = atr_risk / entry_price
-                
-                results["methods"]["atr_based"] = {
-                    "stop_price": atr_stop,
-                    "risk_amount": atr_risk,
-                    "risk_percentage": atr_risk_percentage,
-                    "atr_value": atr,
-                    "explanation": f"ATR-based stop-loss {atr_multiplier} x ATR (${atr:.2f}) below entry price"
-                }
-                
-                # Method 3: Support-based stop-loss (if we have enough data)
-                if len(historical_prices) >= 30:
-                    # Find recent lows as potential support levels
-                    window = 5  # Window for local minimum detection
-                    support_levels = []
-                    
-                    for i in range(window, len(historical_prices) - window):
-                        if all(historical_prices["price"].iloc[i] <= historical_prices["price"].iloc[i-window:i]) and \
-                           all(historical_prices["price"].iloc[i] <= historical_prices["price"].iloc[i+1:i+window+1]):
-                            support_levels.append(historical_prices["price"].iloc[i])
-                    
-                    # Filter support levels below entry price
-                    valid_supports = [s for s in support_levels if s < entry_price]
-                    
-                    if valid_supports:
-                        # Find closest support level below entry price
-                        closest_support = max(valid_supports)
-                        support_risk = entry_price - closest_support
-                        support_risk_percentage = support_risk / entry_price
-                        
-                        results["methods"]["support_based"] = {
-                            "stop_price": closest_support,
-                            "risk_amount": support_risk,
-                            "risk_percentage": support_risk_percentage,
-                            "explanation": f"Support-based stop-loss at nearest support level (${closest_support:.2f})"
-                        }
-            
-            # Determine recommended stop-loss method
-            if "atr_based" in results["methods"] and results["methods"]["atr_based"]["risk_percentage"] <= 0.1:
-                # ATR-based is preferred if risk is reasonable
-                results["recommended_method"] = "atr_based"
-            elif "support_based" in results["methods"] and results["methods"]["support_based"]["risk_percentage"] <= 0.1:
-                # Support-based is next preference if risk is reasonable
-                results["recommended_method"] = "support_based"
-            else:
-                # Fixed percentage is the fallback
-                results["recommended_method"] = "fixed_percentage"
-                
-            # Get the recommended stop-loss price
-            recommended_stop = results["methods"][results["recommended_method"]]["stop_price"]
-            results["recommended_stop_price"] = recommended_stop
-            
-            return results
+            history = prices_array if prices_array is not None else historical_prices
+            return self._calculate_stop_loss_core(entry_price, history, atr_multiplier, fixed_percentage, dtype)
             
         except Exception as e:
             print(f"Error calculating stop-loss: {str(e)}")
@@ -233,6 +263,157 @@ class ETHRiskManager:
                 "error": str(e)
             }
     
+    def _calculate_stop_loss_core(self, entry_price, history, atr_multiplier, fixed_percentage, dtype=None):
+        """Stop-loss calculation without error handling (see calculate_stop_loss)
+
+        history is either a DataFrame with a "price" column or an ndarray of prices.
+        """
+        results = {
+            "entry_price": entry_price,
+            "methods": {}
+        }
+        
+        # Method 1: Fixed percentage stop-loss
+        fixed_stop = entry_price * (1 - fixed_percentage)
+        fixed_risk = entry_price - fixed_stop
+        fixed_risk_percentage = fixed_risk / entry_price
+        
+        results["methods"]["fixed_percentage"] = {
+            "stop_price": fixed_stop,
+            "risk_amount": fixed_risk,
+            "risk_percentage": fixed_risk_percentage,
+            "explanation": f"Fixed {fixed_percentage * 100:.1f}% stop-loss below entry price"
+        }
+        
+        # Method 2: ATR-based stop-loss (if ATR state or historical data is available)
+        has_history = history is not None and len(history) >= 14
+        
+        if has_history:
+            history_atr, support_levels = self._scan_price_history(history, dtype)
+        
+        if self._atr_state is not None:
+            # Use the incrementally maintained ATR
+            atr = self._atr_state
+        elif has_history:
+            atr = history_atr
+        else:
+            atr = None
+        
+        if atr is not None:
+            # Calculate ATR-based stop-loss
+            atr_stop = entry_price - (atr * atr_multiplier)
+            atr_risk = entry_price - atr_stop
+            atr_risk_percentage = atr_risk / entry_price
+            
+            results["methods"]["atr_based"] = {
+                "stop_price": atr_stop,
+                "risk_amount": atr_risk,
+                "risk_percentage": atr_risk_percentage,
+                "atr_value": atr,
+                "explanation": f"ATR-based stop-loss {atr_multiplier} x ATR (${atr:.2f}) below entry price"
+            }
+        
+        # Method 3: Support-based stop-loss (if we have enough data)
+        if has_history and len(history) >= 30:
+            # Filter support levels below entry price
+            valid_supports = [s for s in support_levels if s < entry_price]
+            
+            if valid_supports:
+                # Find closest support level below entry price
+                closest_support = max(valid_supports)
+                support_risk = entry_price - closest_support
+                support_risk_percentage = support_risk / entry_price
+                
+                results["methods"]["support_based"] = {
+                    "stop_price": closest_support,
+                    "risk_amount": support_risk,
+                    "risk_percentage": support_risk_percentage,
+                    "explanation": f"Support-based stop-loss at nearest support level (${closest_support:.2f})"
+                }
+        
+        # Determine recommended stop-loss method
+        if "atr_based" in results["methods"] and results["methods"]["atr_based"]["risk_percentage"] <= 0.1:
+            # ATR-based is preferred if risk is reasonable
+            results["recommended_method"] = "atr_based"
+        elif "support_based" in results["methods"] and results["methods"]["support_based"]["risk_percentage"] <= 0.1:
+            # Support-based is next preference if risk is reasonable
+            results["recommended_method"] = "support_based"
+        else:
+            # Fixed percentage is the fallback
+            results["recommended_method"] = "fixed_percentage"
+            
+        # Get the recommended stop-loss price
+        recommended_stop = results["methods"][results["recommended_method"]]["stop_price"]
+        results["recommended_stop_price"] = recommended_stop
+        
+        return results
+    
+    def _scan_price_history(self, history, dtype=None):
+        """
+        Compute ATR and support levels for a price history, with LRU caching
+        
+        Results are cached on a cheap fingerprint of the history (object identity,
+        length and last price), so repeated stop-loss queries against the same
+        history skip the O(n) scans.
+        
+        Args:
+            history (DataFrame/ndarray): Historical price data or plain price array
+            dtype (numpy dtype): Float type for the scans (see calculate_stop_loss)
+            
+        Returns:
+            tuple: (ATR value, tuple of support levels)
+        """
+        # Long histories drop to float32 (ample precision for prices ~1e3) to
+        # halve the memory traffic of the scans
+        if dtype is None:
+            dtype = np.float32 if len(history) > FLOAT32_HISTORY_LENGTH else np.float64
+        
+        if isinstance(history, pd.DataFrame):
+            history_prices = history["price"]
+            last_price = float(history_prices.iat[-1])
+        else:
+            history_prices = history
+            last_price = float(history_prices[-1])
+        
+        cache_key = (id(history), len(history), last_price, np.dtype(dtype).name)
+        
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            self._history_cache.move_to_end(cache_key)
+            return cached
+        
+        # Extract the prices once; everything below works on the ndarray
+        prices = np.asarray(history_prices, dtype=dtype)
+        
+        # Calculate True Range. With close-only data the two-bar high/low
+        # collapse max(high - low, |high - prev|, |low - prev|) to
+        # |close - prev|, so it is computed in place in a single pass
+        # (the first bar has no previous close)
+        true_range = np.empty_like(prices)
+        true_range[0] = np.nan
+        np.subtract(prices[1:], prices[:-1], out=true_range[1:])
+        np.abs(true_range[1:], out=true_range[1:])
+        
+        # ATR (Average True Range) is the mean of the last 14 true ranges
+        atr = float(true_range[-14:].mean())
+        
+        # Find recent lows as potential support levels: a price is a local
+        # minimum when it is the lowest of the window centred on it
+        support_levels = []
+        if len(prices) >= 30:
+            window = 5  # Window for local minimum detection
+            
+            centres = prices[window:len(prices) - window]
+            window_mins = _rolling_min(prices, 2 * window + 1)
+            support_levels = centres[centres <= window_mins].tolist()
+        
+        result = (atr, tuple(support_levels))
+        self._history_cache[cache_key] = result
+        if len(self._history_cache) > HISTORY_CACHE_SIZE:
+            self._history_cache.popitem(last=False)
+        
+        return result
+    
     def calculate_take_profit_targets(self, entry_price, stop_loss_price, risk_reward_ratios=[1.5, 2.5, 3.5]):
         """
         Calculate take-profit targets based on risk-reward ratios
@@ -246,39 +427,49 @@ class ETHRiskManager:
             dict: Take-profit targets
         """
         try:
-            # Calculate risk amount
-            risk = entry_price - stop_loss_price
-            
-            # Calculate targets
-            targets = []
-            
-            for ratio in risk_reward_ratios:
-                target_price = entry_price + (risk * ratio)
-                profit = target_price - entry_price
-                profit_percentage = profit / entry_price
-                
-                targets.append({
-                    "risk_reward_ratio": ratio,
-                    "target_price": target_price,
-                    "profit_amount": profit,
-                    "profit_percentage": profit_percentage,
-                    "explanation": f"{ratio}R target (R = ${risk:.2f})"
-                })
-            
-            result = {
-                "entry_price": entry_price,
-                "stop_loss_price": stop_loss_price,
-                "risk_amount": risk,
-                "risk_percentage": risk / entry_price,
-                "targets": targets
-            }
-            
-            return result
+            return self._calculate_take_profit_core(entry_price, stop_loss_price, risk_reward_ratios)
             
         except Exception as e:
             print(f"Error calculating take-profit targets: {str(e)}")
             return None
     
+    def _calculate_take_profit_core(self, entry_price, stop_loss_price, risk_reward_ratios):
+        """Take-profit arithmetic without error handling (see calculate_take_profit_targets)"""
+        # Calculate risk amount
+        risk = entry_price - stop_loss_price
+        
+        # Calculate all targets at once
+        ratios = np.asarray(risk_reward_ratios, dtype=np.float64)
+        target_prices = entry_price + risk * ratios
+        profit_amounts = target_prices - entry_price
+        profit_percentages = profit_amounts / entry_price
+        
+        targets = [
+            {
+                "risk_reward_ratio": ratio,
+                "target_price": target_price,
+                "profit_amount": profit,
+                "profit_percentage": profit_percentage,
+                "explanation": f"{ratio}R target (R = ${risk:.2f})"
+            }
+            for ratio, target_price, profit, profit_percentage in zip(
+                risk_reward_ratios,
+                target_prices.tolist(),
+                profit_amounts.tolist(),
+                profit_percentages.tolist()
+            )
+        ]
+        
+        result = {
+            "entry_price": entry_price,
+            "stop_loss_price": stop_loss_price,
+            "risk_amount": risk,
+            "risk_percentage": risk / entry_price,
+            "targets": targets
+        }
+        
+        return result
+    
     def calculate_trailing_stop(self, entry_price, current_price, initial_stop_price, trail_percentage=0.5):
         """
         Calculate trailing stop-loss price
@@ -293,48 +484,115 @@ class ETHRiskManager:
             dict: Trailing stop details
         """
         try:
-            # Only adjust stop if in profit
-            if current_price <= entry_price:
-                return {
-                    "entry_price": entry_price,
-                    "current_price": current_price,
-                    "trailing_stop_price": initial_stop_price,
-                    "is_adjusted": False,
-                    "explanation": "Price has not moved above entry point, using initial stop-loss"
-                }
+            return self._calculate_trailing_stop_core(entry_price, current_price, initial_stop_price, trail_percentage)
             
-            # Calculate trailing stop based on highest price
-            trail_amount = current_price * (trail_percentage / 100)
-            trailing_stop = current_price - trail_amount
-            
-            # Only use trailing stop if it's higher than the initial stop
-            if trailing_stop > initial_stop_price:
-                explanation = (
-                    f"Trailing stop adjusted to ${trailing_stop:.2f}, which is {trail_percentage}% "
-                    f"below the current price of ${current_price:.2f}"
-                )
-                is_adjusted = True
-            else:
-                trailing_stop = initial_stop_price
-                explanation = "Trailing stop would be lower than initial stop-loss, keeping initial stop"
-                is_adjusted = False
-            
-            result = {
+        except Exception as e:
+            print(f"Error calculating trailing stop: {str(e)}")
+            return None
+    
+    def _calculate_trailing_stop_core(self, entry_price, current_price, initial_stop_price, trail_percentage):
+        """Trailing stop arithmetic without error handling (see calculate_trailing_stop)"""
+        # Only adjust stop if in profit
+        if current_price <= entry_price:
+            return {
                 "entry_price": entry_price,
                 "current_price": current_price,
-                "initial_stop_price": initial_stop_price,
-                "trailing_stop_price": trailing_stop,
-                "trail_percentage": trail_percentage,
-                "trail_amount": trail_amount,
-                "is_adjusted": is_adjusted,
-                "explanation": explanation
+                "trailing_stop_price": initial_stop_price,
+                "is_adjusted": False,
+                "explanation": "Price has not moved above entry point, using initial stop-loss"
             }
+        
+        # Calculate trailing stop based on highest price
+        trail_amount = current_price * (trail_percentage / 100)
+        trailing_stop = current_price - trail_amount
+        
+        # Only use trailing stop if it's higher than the initial stop
+        if trailing_stop > initial_stop_price:
+            explanation = (
+                f"Trailing stop adjusted to ${trailing_stop:.2f}, which is {trail_percentage}% "
+                f"below the current price of ${current_price:.2f}"
+            )
+            is_adjusted = True
+        else:
+            trailing_stop = initial_stop_price
+            explanation = "Trailing stop would be lower than initial stop-loss, keeping initial stop"
+            is_adjusted = False
+        
+        result = {
+            "entry_price": entry_price,
+            "current_price": current_price,
+            "initial_stop_price": initial_stop_price,
+            "trailing_stop_price": trailing_stop,
+            "trail_percentage": trail_percentage,
+            "trail_amount": trail_amount,
+            "is_adjusted": is_adjusted,
+            "explanation": explanation
+        }
+        
+        return result
+    
+    def calculate_trailing_stop_series(self, entry_price, prices, initial_stop_price, trail_percentage=0.5):
+        """
+        Calculate the trailing stop-loss price for every bar of a price series
+        
+        Backtesting counterpart of calculate_trailing_stop: the stop trails the
+        highest price seen above entry and never moves down, computed with a
+        single cumulative-max sweep instead of one call per bar.
+        
+        Args:
+            entry_price (float): Entry price for ETH
+            prices (array-like): ETH prices for each bar after entry
+            initial_stop_price (float): Initial stop-loss price
+            trail_percentage (float): Trailing percentage (0.5 = 0.5%)
             
-            return result
+        Returns:
+            ndarray: Trailing stop price for each bar
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        
+        # Highest price so far, counting only bars in profit
+        highs = np.maximum.accumulate(np.where(prices > entry_price, prices, -np.inf))
+        
+        # Trail below the high, never below the initial stop
+        return np.maximum(highs * (1 - trail_percentage / 100), initial_stop_price)
+    
+    def calculate_portfolio_exposures(self, holdings, prices):
+        """
+        Calculate portfolio exposure for several assets in one pass
+        
+        Vectorized counterpart of calculate_portfolio_exposure. Each asset is
+        checked against the same maximum portfolio exposure limit; pass
+        length-1 arrays for a single asset.
+        
+        Args:
+            holdings (array-like): Current holdings in coins, one per asset
+            prices (array-like): Current prices in USD, one per asset
             
-        except Exception as e:
-            print(f"Error calculating trailing stop: {str(e)}")
-            return None
+        Returns:
+            dict: Portfolio exposure details, one array element per asset
+        """
+        holdings = np.asarray(holdings, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        
+        # Value and exposure of each asset
+        values = holdings * prices
+        exposure_percentages = values / self.portfolio_value
+        exceeds_limit = exposure_percentages > self.max_portfolio_exposure
+        
+        # Holdings to sell to get each asset back within the limit
+        max_holdings = self._max_position_dollars / prices
+        adjustments_needed = np.where(exceeds_limit, holdings - max_holdings, 0.0)
+        
+        return {
+            "holdings": holdings,
+            "prices": prices,
+            "values": values,
+            "exposure_percentages": exposure_percentages,
+            "max_exposure": self.max_portfolio_exposure,
+            "exceeds_limit": exceeds_limit,
+            "max_holdings": max_holdings,
+            "adjustments_needed": adjustments_needed
+        }
     
     def calculate_portfolio_exposure(self, eth_holdings, eth_price):
         """
@@ -359,7 +617,7 @@ class ETHRiskManager:
             
             # Calculate adjustment if needed
             if exceeds_limit:
-                max_eth_value = self.portfolio_value * self.max_portfolio_exposure
+                max_eth_value = self._max_position_dollars
                 max_eth_holdings = max_eth_value / eth_price
                 adjustment_needed = eth_holdings - max_eth_holdings
                 
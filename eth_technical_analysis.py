@@ -14,13 +14,601 @@ import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import os
+from collections import OrderedDict, deque
+
+try:
+    import numba  # noqa: F401
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False  # Optional: pandas falls back to its Cython kernels
+
+# Histories longer than this are processed in float32 by the vectorized indicators
+FLOAT32_HISTORY_LENGTH = 10_000
+
+# Histories up to this length run the MACD EMAs as a plain-Python loop; longer
+# ones use pandas' compiled ewm, which is faster once the series is this long
+MACD_LOOP_MAX_LENGTH = 2_000
+
+# Number of recent analyze_price_data results kept for repeated queries
+ANALYSIS_CACHE_SIZE = 8
+
+# Text for the (code, value) explanation entries of analyze_price_data
+EXPLANATION_TEMPLATES = {
+    "rsi_oversold": "RSI is oversold ({:.1f})",
+    "rsi_overbought": "RSI is overbought ({:.1f})",
+    "rsi_neutral": "RSI is neutral ({:.1f})",
+    "macd": "MACD signal is {}",
+    "golden_cross": "Golden cross detected (bullish)",
+    "death_cross": "Death cross detected (bearish)",
+    "ma_above": "Price is above {:.2f} MA (bullish)",
+    "ma_below": "Price is below {:.2f} MA (bearish)"
+}
+
+# Price charts are downsampled to at most this many points before plotting
+CHART_MAX_POINTS = 2000
+
+# Series at least this long use pandas' numba engine for window operations when
+# numba is installed; below it the JIT compile cost outweighs the speedup
+NUMBA_ENGINE_MIN_LENGTH = 10_000
+
+
+def _price_array(prices):
+    """
+    Contiguous float array of prices for the vectorized indicators
+    
+    Long histories drop to float32 (ample precision for prices ~1e3) to halve
+    the memory traffic of the array passes; shorter ones stay float64.
+    
+    Args:
+        prices (list/array): List of price values
+        
+    Returns:
+        ndarray: Price values
+    """
+    dtype = np.float32 if len(prices) > FLOAT32_HISTORY_LENGTH else np.float64
+    return np.ascontiguousarray(prices, dtype=dtype)
+
+
+def _macd_last(prices, fast_alpha, slow_alpha, signal_alpha):
+    """
+    Final MACD values from one pass over the prices
+    
+    Both EMAs and the signal line are advanced together as scalar
+    recurrences, matching pandas ewm(adjust=False): the price EMAs are seeded
+    with the first price and the signal line with the first MACD value (0).
+    
+    Args:
+        prices (list): Price values
+        fast_alpha (float): Smoothing factor of the fast EMA
+        slow_alpha (float): Smoothing factor of the slow EMA
+        signal_alpha (float): Smoothing factor of the signal line
+        
+    Returns:
+        tuple: (MACD line, signal line, histogram, previous histogram)
+    """
+    ema_fast = ema_slow = prices[0]
+    ema_signal = histogram = previous_histogram = 0.0
+    for price in prices:
+        ema_fast += fast_alpha * (price - ema_fast)
+        ema_slow += slow_alpha * (price - ema_slow)
+        macd = ema_fast - ema_slow
+        ema_signal += signal_alpha * (macd - ema_signal)
+        previous_histogram = histogram
+        histogram = macd - ema_signal
+    return ema_fast - ema_slow, ema_signal, histogram, previous_histogram
+
+
+def _macd_last_ewm(prices, fast_period, slow_period, signal_period):
+    """
+    Final MACD values from pandas ewm, for histories too long for _macd_last
+    
+    Args:
+        prices (list/array): Price values
+        fast_period (int): Fast EMA period
+        slow_period (int): Slow EMA period
+        signal_period (int): Signal line period
+        
+    Returns:
+        tuple: (MACD line, signal line, histogram, previous histogram)
+    """
+    prices_series = pd.Series(np.asarray(prices, dtype=np.float64))
+    macd_line = (prices_series.ewm(span=fast_period, adjust=False).mean()
+                 - prices_series.ewm(span=slow_period, adjust=False).mean())
+    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    histogram = (macd_line - signal_line).to_numpy()
+    return float(macd_line.iat[-1]), float(signal_line.iat[-1]), float(histogram[-1]), float(histogram[-2])
+
+
+def _ewma_last(values, alpha):
+    """
+    Final value of an exponentially weighted moving average
+    
+    Same result as pandas ewm(alpha=alpha, adjust=False).mean().iloc[-1],
+    computed as one dot product with the EMA weights. Weights older than the
+    horizon where they fall below float64 resolution are dropped, so the cost
+    does not grow with the length of the history.
+    
+    Args:
+        values (ndarray): Input values
+        alpha (float): Smoothing factor
+        
+    Returns:
+        float: Last EMA value
+    """
+    horizon = int(np.ceil(np.log(np.finfo(np.float64).eps) / np.log1p(-alpha)))
+    seeded = len(values) <= horizon
+    values = values[-horizon:]
+    weights = alpha * (1 - alpha) ** np.arange(len(values) - 1, -1, -1, dtype=np.float64)
+    if seeded:
+        # The first value seeds the average with weight (1 - alpha)^(n-1)
+        weights[0] /= alpha
+    return float(np.dot(weights, values))
+
+
+def _trailing_means(values, window):
+    """
+    Mean of the last full window and of the window one step earlier
+    
+    Equivalent to rolling(window).mean().iloc[-1] and .iloc[-2] without
+    computing the whole rolling series.
+    
+    Args:
+        values (ndarray): Input values
+        window (int): Window size
+        
+    Returns:
+        tuple: (current mean, previous mean), NaN where there is not enough data
+    """
+    current = values[-window:].mean() if len(values) >= window else np.nan
+    previous = values[-window - 1:-1].mean() if len(values) > window else np.nan
+    return current, previous
+
+
+def _sliding_extreme(values, width, ufunc):
+    """
+    Sliding-window minimum or maximum in O(N) (van Herk/Gil-Werman)
+    
+    The series is split into blocks of `width`; every window spans the suffix
+    of one block and the prefix of the next, so its extremum is the combination
+    of a running suffix and prefix extremum. This costs about three comparisons
+    per element whatever the window size, instead of `width`.
+    
+    Args:
+        values (ndarray): Input values
+        width (int): Window width
+        ufunc (ufunc): np.minimum for a sliding min, np.maximum for a sliding max
+        
+    Returns:
+        ndarray: Extremum of each full window (len(values) - width + 1 values)
+    """
+    n = len(values)
+    n_blocks = -(-n // width)
+    
+    # Pad the last block with the identity of the reduction
+    padded = np.full(n_blocks * width, np.inf if ufunc is np.minimum else -np.inf, dtype=values.dtype)
+    padded[:n] = values
+    blocks = padded.reshape(n_blocks, width)
+    
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    
+    return ufunc(suffix[:n - width + 1], prefix[width - 1:n])
+
+
+def _lttb_indices(values, target):
+    """
+    Indices of a Largest-Triangle-Three-Buckets downsampling of a series
+    
+    Keeps the first and last points and, from each of the target - 2 buckets
+    in between, the point forming the largest triangle with the previously
+    kept point and the average of the next bucket. Points are assumed to be
+    evenly spaced, so positions are used as the x coordinate.
+    
+    Args:
+        values (ndarray): Series to downsample
+        target (int): Number of points to keep
+        
+    Returns:
+        ndarray: Sorted indices of the points to keep (all indices if the
+            series is not longer than target)
+    """
+    n = len(values)
+    if target >= n or target < 3:
+        return np.arange(n)
+    
+    bucket_size = (n - 2) / (target - 2)
+    selected = np.empty(target, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    previous = 0
+    for i in range(target - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        
+        # Average point of the next bucket
+        next_x = (end + next_end - 1) / 2
+        next_y = values[end:next_end].mean()
+        
+        # Twice the triangle area for every candidate in this bucket
+        candidates = np.arange(start, end)
+        areas = np.abs((previous - next_x) * (values[start:end] - values[previous])
+                       - (previous - candidates) * (next_y - values[previous]))
+        previous = start + int(areas.argmax())
+        selected[i + 1] = previous
+    
+    return selected
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    """RSI value from Wilder-smoothed average gain and loss"""
+    if avg_loss == 0:
+        return 100  # No losses, RSI is 100
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _recurrent_indicators(prices, rsi_window=14, fast_period=12, slow_period=26, signal_period=9):
+    """
+    Final RSI and MACD state from a single pass over the prices
+    
+    The Wilder RSI averages and the three MACD EMAs are all scalar
+    recurrences, so they are advanced together in one loop instead of
+    traversing the series once per indicator.
+    
+    Args:
+        prices (list): Price values (at least two)
+        rsi_window (int): RSI window/period
+        fast_period (int): Fast EMA period for MACD
+        slow_period (int): Slow EMA period for MACD
+        signal_period (int): Signal line period for MACD
+        
+    Returns:
+        dict: Average gain/loss, MACD line, signal line and last two histogram values
+    """
+    rsi_alpha = 1 / rsi_window
+    fast_alpha = 2 / (fast_period + 1)
+    slow_alpha = 2 / (slow_period + 1)
+    signal_alpha = 2 / (signal_period + 1)
+    
+    # The first price seeds the EMAs; the first change seeds the RSI averages
+    previous_price = prices[0]
+    change = prices[1] - previous_price
+    avg_gain = change if change > 0 else 0.0
+    avg_loss = -change if change < 0 else 0.0
+    ema_fast = ema_slow = previous_price
+    ema_signal = histogram = previous_histogram = 0.0
+    
+    for i, price in enumerate(prices):
+        if i > 1:
+            change = price - previous_price
+            avg_gain += rsi_alpha * ((change if change > 0 else 0.0) - avg_gain)
+            avg_loss += rsi_alpha * ((-change if change < 0 else 0.0) - avg_loss)
+        previous_price = price
+        
+        ema_fast += fast_alpha * (price - ema_fast)
+        ema_slow += slow_alpha * (price - ema_slow)
+        macd = ema_fast - ema_slow
+        ema_signal += signal_alpha * (macd - ema_signal)
+        previous_histogram = histogram
+        histogram = macd - ema_signal
+    
+    return {
+        "avg_gain": avg_gain,
+        "avg_loss": avg_loss,
+        "macd_line": ema_fast - ema_slow,
+        "signal_line": ema_signal,
+        "histogram": histogram,
+        "previous_histogram": previous_histogram
+    }
+
+
+def _closest_levels(levels, price, count):
+    """
+    The levels closest to a price, closest first
+    
+    Uses a partial selection (np.argpartition) so only the chosen few levels
+    are sorted rather than all candidates.
+    
+    Args:
+        levels (ndarray): Candidate price levels
+        price (float): Reference price
+        count (int): Number of levels to keep
+        
+    Returns:
+        ndarray: Up to `count` levels ordered by distance from the price
+    """
+    distance = np.abs(levels - price)
+    if len(levels) > count:
+        closest = np.argpartition(distance, count - 1)[:count]
+        levels, distance = levels[closest], distance[closest]
+    return levels[np.argsort(distance, kind="stable")]
+
+
+def _support_resistance_levels(prices, window=10):
+    """
+    Support and resistance levels as NumPy arrays
+    
+    Backs ETHTechnicalAnalysis.identify_support_resistance, which returns
+    the same levels as lists; analyze_price_data uses the arrays directly.
+    
+    Args:
+        prices (list/array): List of price values
+        window (int): Window size for local min/max detection
+        
+    Returns:
+        dict: Support and resistance level arrays, closest to the current price first
+    """
+    if len(prices) < window * 3:
+        print(f"Warning: Not enough data for support/resistance analysis. Need {window*3}, got {len(prices)}")
+        return {"support": np.empty(0), "resistance": np.empty(0)}
+        
+    # Convert to numpy array if it's not already
+    prices_array = _price_array(prices)
+    
+    # Find local minima and maxima: a point is a level when it is the
+    # extremum of the window centred on it. Compare against the window
+    # min/max rather than argmin/argmax so ties still count as levels.
+    width = 2 * window + 1
+    centres = prices_array[window:-window]
+    is_support = _sliding_extreme(prices_array, width, np.minimum) == centres
+    is_resistance = _sliding_extreme(prices_array, width, np.maximum) == centres
+    
+    # Report the levels at full precision even when they were located in float32
+    prices_float64 = np.asarray(prices, dtype=np.float64)
+    support_levels = prices_float64[window:-window][is_support]
+    resistance_levels = prices_float64[window:-window][is_resistance]
+    
+    # Get the most recent price
+    current_price = prices_float64[-1]
+    
+    # Filter levels that are close to current price
+    relevant_support = support_levels[support_levels < current_price]
+    relevant_resistance = resistance_levels[resistance_levels > current_price]
+    
+    # Take top 3 most relevant levels: the closest to the current price,
+    # i.e. highest support first and lowest resistance first
+    top_support = _closest_levels(relevant_support, current_price, 3)
+    top_resistance = _closest_levels(relevant_resistance, current_price, 3)
+    
+    return {
+        "support": top_support,
+        "resistance": top_resistance
+    }
+
+
+def _rolling_mean(values, window):
+    """
+    Full rolling-mean series from one cumulative sum
+    
+    Args:
+        values (ndarray): Input values
+        window (int): Window size
+        
+    Returns:
+        ndarray: Mean of each trailing window, NaN for the first window - 1 values
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        result[window - 1:] = (cumulative[window:] - cumulative[:-window]) / window
+    return result
+
+
+def _macd_crossover(current_histogram, previous_histogram):
+    """Buy/sell signal from the MACD histogram crossing zero"""
+    if current_histogram > 0 and previous_histogram < 0:
+        return "buy"
+    elif current_histogram < 0 and previous_histogram > 0:
+        return "sell"
+    return "neutral"
+
+
+def _ma_cross_result(ma_short_current, ma_long_current, ma_short_previous, ma_long_previous):
+    """
+    Classify the short/long moving-average relationship
+    
+    Args:
+        ma_short_current (float): Current short-term MA
+        ma_long_current (float): Current long-term MA
+        ma_short_previous (float): Previous short-term MA (NaN if unknown)
+        ma_long_previous (float): Previous long-term MA (NaN if unknown)
+        
+    Returns:
+        dict: Dictionary containing MA values and cross signal
+    """
+    if np.isnan(ma_short_previous) or np.isnan(ma_long_previous):
+        # Just check current state
+        if ma_short_current > ma_long_current:
+            signal = "above"
+        else:
+            signal = "below"
+    # Check for golden cross (short MA crosses above long MA)
+    elif ma_short_current > ma_long_current and ma_short_previous <= ma_long_previous:
+        signal = "golden_cross"
+    # Check for death cross (short MA crosses below long MA)
+    elif ma_short_current < ma_long_current and ma_short_previous >= ma_long_previous:
+        signal = "death_cross"
+    # Check if currently in golden cross state
+    elif ma_short_current > ma_long_current:
+        signal = "above"
+    else:
+        signal = "below"
+    
+    return {
+        "ma_short": ma_short_current,
+        "ma_long": ma_long_current,
+        "signal": signal,
+        "golden_cross": signal == "golden_cross",
+        "death_cross": signal == "death_cross"
+    }
+
+
+class _IndicatorStream:
+    """
+    Online RSI, MACD and moving-average state for streaming price updates
+    
+    Fitted once on a price history, then each new price is folded in with O(1)
+    work instead of recomputing the indicators over the whole history. The
+    result methods return the same structures as the ETHTechnicalAnalysis
+    indicator methods with default parameters.
+    """
+    
+    def __init__(self, prices, rsi_window=14, fast_period=12, slow_period=26, signal_period=9,
+                 ma_short=50, ma_long=200):
+        """
+        Fit the indicator state on an initial price history
+        
+        Args:
+            prices (list/array): Initial price history (at least one price)
+            rsi_window (int): RSI window/period
+            fast_period (int): Fast EMA period for MACD
+            slow_period (int): Slow EMA period for MACD
+            signal_period (int): Signal line period for MACD
+            ma_short (int): Short-term MA period
+            ma_long (int): Long-term MA period
+        """
+        self.rsi_window = rsi_window
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.ma_short = ma_short
+        self.ma_long = ma_long
+        
+        self._rsi_alpha = 1 / rsi_window
+        self._fast_alpha = 2 / (fast_period + 1)
+        self._slow_alpha = 2 / (slow_period + 1)
+        self._signal_alpha = 2 / (signal_period + 1)
+        
+        prices = np.asarray(prices, dtype=np.float64).tolist()
+        self.count = 1
+        self.first_price = prices[0]
+        self.last_price = prices[0]
+        
+        # Wilder averages of gains/losses (seeded by the first price change)
+        self._avg_gain = None
+        self._avg_loss = None
+        
+        # MACD EMAs, seeded with the first price as in ewm(adjust=False)
+        self._ema_fast = prices[0]
+        self._ema_slow = prices[0]
+        self._ema_signal = 0.0
+        self._histogram = 0.0
+        self._previous_histogram = 0.0
+        
+        # Rolling windows and their running sums for the moving averages
+        self._short_window = deque([prices[0]], maxlen=ma_short)
+        self._long_window = deque([prices[0]], maxlen=ma_long)
+        self._short_sum = prices[0]
+        self._long_sum = prices[0]
+        self._previous_ma = (np.nan, np.nan)
+        
+        for price in prices[1:]:
+            self.update(price)
+    
+    def update(self, price):
+        """
+        Fold one new price into the indicator state
+        
+        Args:
+            price (float): Latest price
+        """
+        price = float(price)
+        
+        # RSI
+        change = price - self.last_price
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if self._avg_gain is None:
+            self._avg_gain = gain
+            self._avg_loss = loss
+        else:
+            self._avg_gain += self._rsi_alpha * (gain - self._avg_gain)
+            self._avg_loss += self._rsi_alpha * (loss - self._avg_loss)
+        
+        # MACD
+        self._ema_fast += self._fast_alpha * (price - self._ema_fast)
+        self._ema_slow += self._slow_alpha * (price - self._ema_slow)
+        macd = self._ema_fast - self._ema_slow
+        self._ema_signal += self._signal_alpha * (macd - self._ema_signal)
+        self._previous_histogram = self._histogram
+        self._histogram = macd - self._ema_signal
+        
+        # Moving averages
+        self._previous_ma = self._current_ma()
+        if len(self._short_window) == self.ma_short:
+            self._short_sum -= self._short_window[0]
+        if len(self._long_window) == self.ma_long:
+            self._long_sum -= self._long_window[0]
+        self._short_window.append(price)
+        self._long_window.append(price)
+        self._short_sum += price
+        self._long_sum += price
+        
+        self.count += 1
+        self.last_price = price
+    
+    def _current_ma(self):
+        """Current (short, long) moving averages, NaN until each window is full"""
+        ma_short = self._short_sum / self.ma_short if len(self._short_window) == self.ma_short else np.nan
+        ma_long = self._long_sum / self.ma_long if len(self._long_window) == self.ma_long else np.nan
+        return ma_short, ma_long
+    
+    def rsi(self):
+        """Current RSI value (see ETHTechnicalAnalysis.calculate_rsi)"""
+        if self.count < self.rsi_window + 1:
+            return 50  # Not enough data, return neutral RSI
+        return _rsi_from_averages(self._avg_gain, self._avg_loss)
+    
+    def macd(self):
+        """Current MACD values and signal (see ETHTechnicalAnalysis.calculate_macd)"""
+        if self.count < self.slow_period + self.signal_period:
+            return {"signal": "neutral"}
+        return {
+            "macd_line": self._ema_fast - self._ema_slow,
+            "signal_line": self._ema_signal,
+            "histogram": self._histogram,
+            "signal": _macd_crossover(self._histogram, self._previous_histogram)
+        }
+    
+    def moving_averages(self):
+        """Current MA values and cross signal (see ETHTechnicalAnalysis.check_moving_averages)"""
+        ma_short_current, ma_long_current = self._current_ma()
+        if self.count < self.ma_long or np.isnan(ma_short_current) or np.isnan(ma_long_current):
+            return {"signal": "insufficient_data"}
+        return _ma_cross_result(ma_short_current, ma_long_current, *self._previous_ma)
+
 
 class ETHTechnicalAnalysis:
     """Class for performing technical analysis on ETH price data"""
     
+    # Score contributed by each (indicator, signal) to the buy/sell totals
+    _BUY_WEIGHTS = {
+        ("rsi", "oversold"): 1,
+        ("macd", "buy"): 1,
+        ("ma", "golden_cross"): 2,
+        ("ma", "above"): 0.5,
+        ("sr", "near_support"): 0.5
+    }
+    _SELL_WEIGHTS = {
+        ("rsi", "overbought"): 1,
+        ("macd", "sell"): 1,
+        ("ma", "death_cross"): 2,
+        ("ma", "below"): 0.5,
+        ("sr", "near_resistance"): 0.5
+    }
+    
     def __init__(self):
         """Initialize the technical analysis module"""
-        pass
+        # Streaming indicator state for incremental refreshes (see update)
+        self._stream = None
+        self._stream_history = None
+        
+        # Recent analysis results keyed on (length, last timestamp, last price)
+        self._analysis_cache = OrderedDict()
+        
+        # Gain/loss buffers reused across calculate_rsi calls
+        self._rsi_gains = None
+        self._rsi_losses = None
     
     def calculate_rsi(self, prices, window=14):
         """
@@ -37,36 +625,69 @@ class ETHTechnicalAnalysis:
             print(f"Warning: Not enough data to calculate RSI. Need {window+1}, got {len(prices)}")
             return 50  # Not enough data, return neutral RSI
             
-        try:
-            # Convert to numpy array if it's not already
-            prices_array = np.array(prices)
-            
-            # Calculate price changes
-            price_diff = np.diff(prices_array)
-            
-            # Create arrays for gains and losses
-            gains = np.copy(price_diff)
-            losses = np.copy(price_diff)
-            gains[gains < 0] = 0
-            losses[losses > 0] = 0
-            losses = np.abs(losses)
-            
-            # Calculate average gains and losses
-            avg_gain = np.mean(gains[:window])
-            avg_loss = np.mean(losses[:window])
-            
-            if avg_loss == 0:
-                return 100  # No losses, RSI is 100
-                
-            # Calculate RS and RSI
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+        # Convert to numpy array if it's not already
+        prices_array = _price_array(prices)
+        
+        # Reuse the gain/loss buffers, growing them only for longer histories
+        n = len(prices_array) - 1
+        if (self._rsi_gains is None or len(self._rsi_gains) < n
+                or self._rsi_gains.dtype != prices_array.dtype):
+            self._rsi_gains = np.empty(n, dtype=prices_array.dtype)
+            self._rsi_losses = np.empty(n, dtype=prices_array.dtype)
+        gains = self._rsi_gains[:n]
+        losses = self._rsi_losses[:n]
+        
+        # Calculate price changes and split them into gains and losses
+        np.subtract(prices_array[1:], prices_array[:-1], out=gains)
+        np.negative(gains, out=losses)
+        np.maximum(gains, 0, out=gains)
+        np.maximum(losses, 0, out=losses)
+        
+        # Calculate average gains and losses with Wilder smoothing over the
+        # whole series (an EMA with alpha = 1/window)
+        avg_gain = _ewma_last(gains, 1 / window)
+        avg_loss = _ewma_last(losses, 1 / window)
+        
+        if avg_loss == 0:
+            return 100  # No losses, RSI is 100
             
-            return rsi
+        # Calculate RS and RSI
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+        
+        return rsi
+    
+    def calculate_rsi_multi(self, prices, windows=(7, 14, 21)):
+        """
+        Calculate the RSI for several windows at once
+        
+        The price changes are computed once and shared; each window then only
+        costs its two Wilder averages.
+        
+        Args:
+            prices (list/array): List of price values
+            windows (tuple): RSI windows/periods
             
-        except Exception as e:
-            print(f"Error calculating RSI: {str(e)}")
-            return 50  # Return neutral RSI on error
+        Returns:
+            dict: RSI value for each window (50 where there is not enough data)
+        """
+        prices_array = _price_array(prices)
+        
+        # Calculate price changes and split them into gains and losses
+        price_diff = np.diff(prices_array)
+        gains = np.maximum(price_diff, 0)
+        losses = np.maximum(-price_diff, 0)
+        
+        rsi_values = {}
+        for window in windows:
+            if len(prices_array) < window + 1:
+                rsi_values[window] = 50  # Not enough data, return neutral RSI
+            else:
+                rsi_values[window] = _rsi_from_averages(
+                    _ewma_last(gains, 1 / window), _ewma_last(losses, 1 / window)
+                )
+        
+        return rsi_values
     
     def calculate_macd(self, prices, fast_period=12, slow_period=26, signal_period=9):
         """
@@ -81,49 +702,33 @@ class ETHTechnicalAnalysis:
         Returns:
             dict: Dictionary containing MACD line, signal line, histogram, and signal
         """
-        try:
-            if len(prices) < slow_period + signal_period:
-                print(f"Warning: Not enough data for MACD calculation. Need {slow_period+signal_period}, got {len(prices)}")
-                return {"signal": "neutral"}
-                
-            # Convert to pandas Series if it's not already
-            prices_series = pd.Series(prices)
-            
-            # Calculate EMAs
-            ema_fast = prices_series.ewm(span=fast_period, adjust=False).mean()
-            ema_slow = prices_series.ewm(span=slow_period, adjust=False).mean()
-            
-            # Calculate MACD line and signal line
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-            
-            # Calculate histogram
-            histogram = macd_line - signal_line
-            
-            # Determine buy/sell signal
-            if len(histogram) < 2:
-                signal = "neutral"
-            else:
-                current_histogram = histogram.iloc[-1]
-                previous_histogram = histogram.iloc[-2]
-                
-                if current_histogram > 0 and previous_histogram < 0:
-                    signal = "buy"
-                elif current_histogram < 0 and previous_histogram > 0:
-                    signal = "sell"
-                else:
-                    signal = "neutral"
+        if len(prices) < slow_period + signal_period:
+            print(f"Warning: Not enough data for MACD calculation. Need {slow_period+signal_period}, got {len(prices)}")
+            return {"signal": "neutral"}
             
-            return {
-                "macd_line": macd_line.iloc[-1],
-                "signal_line": signal_line.iloc[-1],
-                "histogram": histogram.iloc[-1],
-                "signal": signal
-            }
+        if len(prices) > MACD_LOOP_MAX_LENGTH:
+            # Long histories: the per-element cost of a Python loop dominates
+            macd_line, signal_line, histogram, previous_histogram = _macd_last_ewm(
+                prices, fast_period, slow_period, signal_period
+            )
+        else:
+            # Work on plain floats; the EMAs are short scalar recurrences
+            prices_list = np.asarray(prices, dtype=np.float64).tolist()
             
-        except Exception as e:
-            print(f"Error calculating MACD: {str(e)}")
-            return {"signal": "neutral"}
+            # Calculate the EMAs, MACD line, signal line and histogram in one pass
+            macd_line, signal_line, histogram, previous_histogram = _macd_last(
+                prices_list, 2 / (fast_period + 1), 2 / (slow_period + 1), 2 / (signal_period + 1)
+            )
+        
+        # Determine buy/sell signal
+        signal = _macd_crossover(histogram, previous_histogram)
+        
+        return {
+            "macd_line": macd_line,
+            "signal_line": signal_line,
+            "histogram": histogram,
+            "signal": signal
+        }
     
     def check_moving_averages(self, prices, ma_short=50, ma_long=200):
         """
@@ -137,66 +742,25 @@ class ETHTechnicalAnalysis:
         Returns:
             dict: Dictionary containing MA values and cross signal
         """
-        try:
-            if len(prices) < ma_long:
-                print(f"Warning: Not enough data for moving average analysis. Need {ma_long}, got {len(prices)}")
-                return {"signal": "insufficient_data"}
-                
-            # Convert to pandas Series if it's not already
-            prices_series = pd.Series(prices)
-            
-            # Calculate MAs
-            ma_short_values = prices_series.rolling(window=ma_short).mean()
-            ma_long_values = prices_series.rolling(window=ma_long).mean()
-            
-            # Get current and previous values
-            ma_short_current = ma_short_values.iloc[-1]
-            ma_long_current = ma_long_values.iloc[-1]
+        if len(prices) < ma_long:
+            print(f"Warning: Not enough data for moving average analysis. Need {ma_long}, got {len(prices)}")
+            return {"signal": "insufficient_data"}
             
-            if pd.isna(ma_short_current) or pd.isna(ma_long_current):
-                return {"signal": "insufficient_data"}
-                
-            # Check if we have enough data for previous values
-            if len(ma_short_values) < 3 or len(ma_long_values) < 3:
-                # Just check current state
-                if ma_short_current > ma_long_current:
-                    signal = "above"
-                else:
-                    signal = "below"
-            else:
-                ma_short_previous = ma_short_values.iloc[-2]
-                ma_long_previous = ma_long_values.iloc[-2]
-                
-                if pd.isna(ma_short_previous) or pd.isna(ma_long_previous):
-                    # Just check current state
-                    if ma_short_current > ma_long_current:
-                        signal = "above"
-                    else:
-                        signal = "below"
-                else:
-                    # Check for golden cross (short MA crosses above long MA)
-                    if ma_short_current > ma_long_current and ma_short_previous <= ma_long_previous:
-                        signal = "golden_cross"
-                    # Check for death cross (short MA crosses below long MA)
-                    elif ma_short_current < ma_long_current and ma_short_previous >= ma_long_previous:
-                        signal = "death_cross"
-                    # Check if currently in golden cross state
-                    elif ma_short_current > ma_long_current:
-                        signal = "above"
-                    else:
-                        signal = "below"
-            
-            return {
-                "ma_short": ma_short_current,
-                "ma_long": ma_long_current,
-                "signal": signal,
-                "golden_cross": signal == "golden_cross",
-                "death_cross": signal == "death_cross"
-            }
+        # Convert to numpy array if it's not already
+        prices_array = _price_array(prices)
+        
+        # Calculate current and previous MA values (only the last two are needed)
+        ma_short_current, ma_short_previous = _trailing_means(prices_array, ma_short)
+        ma_long_current, ma_long_previous = _trailing_means(prices_array, ma_long)
+        
+        if np.isnan(ma_short_current) or np.isnan(ma_long_current):
+            return {"signal": "insufficient_data"}
             
-        except Exception as e:
-            print(f"Error checking moving averages: {str(e)}")
-            return {"signal": "error"}
+        # Check if we have enough data for previous values
+        if len(prices_array) < 3:
+            ma_short_previous = ma_long_previous = np.nan
+        
+        return _ma_cross_result(ma_short_current, ma_long_current, ma_short_previous, ma_long_previous)
     
     def identify_support_resistance(self, prices, window=10):
         """
@@ -207,59 +771,87 @@ class ETHTechnicalAnalysis:
             window (int): Window size for local min/max detection
             
         Returns:
-            dict: Dictionary containing support and resistance levels
+            dict: Dictionary containing support and resistance levels as lists
+                of floats (up to 3 each), closest to the current price first
         """
-        try:
-            if len(prices) < window * 3:
-                print(f"Warning: Not enough data for support/resistance analysis. Need {window*3}, got {len(prices)}")
-                return {"support": [], "resistance": []}
-                
-            # Convert to numpy array if it's not already
-            prices_array = np.array(prices)
-            
-            # Find local minima and maxima
-            support_levels = []
-            resistance_levels = []
-            
-            for i in range(window, len(prices_array) - window):
-                # Check if this point is a local minimum (support)
-                if all(prices_array[i] <= prices_array[i-window:i]) and all(prices_array[i] <= prices_array[i+1:i+window+1]):
-                    support_levels.append(prices_array[i])
-                
-                # Check if this point is a local maximum (resistance)
-                if all(prices_array[i] >= prices_array[i-window:i]) and all(prices_array[i] >= prices_array[i+1:i+window+1]):
-                    resistance_levels.append(prices_array[i])
-            
-            # Get the most recent price
-            current_price = prices_array[-1]
-            
-            # Filter levels that are close to current price
-            relevant_support = [level for level in support_levels if level < current_price]
-            relevant_resistance = [level for level in resistance_levels if level > current_price]
-            
-            # Sort levels
-            relevant_support.sort(reverse=True)  # Highest support first
-            relevant_resistance.sort()  # Lowest resistance first
+        levels = _support_resistance_levels(prices, window)
+        return {name: values.tolist() for name, values in levels.items()}
+    
+    def update(self, price):
+        """
+        Add one new price to the streaming indicators in O(1)
+        
+        Continues from the history passed to the last analyze_price_data call,
+        so a live dashboard can refresh RSI, MACD and moving averages per tick
+        without recomputing them over the whole history.
+        
+        Args:
+            price (float): Latest ETH price
             
-            # Take top 3 most relevant levels
-            top_support = relevant_support[:3] if relevant_support else []
-            top_resistance = relevant_resistance[:3] if relevant_resistance else []
+        Returns:
+            dict: Latest RSI value, MACD result and moving-average result
+        """
+        if self._stream is None:
+            if self._stream_history is None:
+                raise ValueError("No price history to update; call analyze_price_data first")
+            self._stream = _IndicatorStream(self._stream_history)
+            self._stream_history = None
+        
+        self._stream.update(price)
+        
+        return {
+            "rsi": self._stream.rsi(),
+            "macd": self._stream.macd(),
+            "moving_averages": self._stream.moving_averages()
+        }
+    
+    def _advance_stream(self, prices):
+        """
+        Advance the streaming indicators if prices extend the last seen history by one bar
+        
+        Args:
+            prices (array): Full price history
             
-            return {
-                "support": top_support,
-                "resistance": top_resistance
-            }
+        Returns:
+            _IndicatorStream: Updated stream, or None if prices are not a one-bar extension
+        """
+        if self._stream is not None:
+            count, first_price, last_price = self._stream.count, self._stream.first_price, self._stream.last_price
+        elif self._stream_history is not None and len(self._stream_history) > 0:
+            history = self._stream_history
+            count, first_price, last_price = len(history), history[0], history[-1]
+        else:
+            return None
+        
+        if len(prices) != count + 1 or prices[0] != first_price or prices[-2] != last_price:
+            return None
+        
+        if self._stream is None:
+            self._stream = _IndicatorStream(self._stream_history)
+        self._stream.update(prices[-1])
+        return self._stream
+    
+    @staticmethod
+    def format_explanation(explanation):
+        """
+        Format compact (code, value) explanation entries as text
+        
+        Args:
+            explanation (list): (code, value) tuples from analyze_price_data(verbose=False)
             
-        except Exception as e:
-            print(f"Error identifying support/resistance: {str(e)}")
-            return {"support": [], "resistance": []}
+        Returns:
+            list: Explanation strings
+        """
+        return [EXPLANATION_TEMPLATES[code].format(value) for code, value in explanation]
     
-    def analyze_price_data(self, df):
+    def analyze_price_data(self, df, verbose=True):
         """
         Perform comprehensive technical analysis on price data
         
         Args:
             df (DataFrame): DataFrame with price data
+            verbose (bool): Format the explanation as text; if False it is left as
+                (code, value) tuples for format_explanation to render on demand
             
         Returns:
             dict: Dictionary containing analysis results
@@ -268,48 +860,84 @@ class ETHTechnicalAnalysis:
             if df.empty:
                 print("Error: Empty DataFrame provided for analysis")
                 return {}
+            
+            # Reuse the previous result if the data has not advanced since
+            cache_key = (
+                len(df),
+                df["timestamp"].iat[-1] if "timestamp" in df.columns else None,
+                float(df["price"].iat[-1]),
+                verbose
+            )
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                # Callers add to and edit the result, so hand out fresh lists
+                return {key: list(value) if isinstance(value, tuple) else value
+                        for key, value in cached.items()}
                 
-            # Extract price data
-            prices = df["price"].values
+            # Extract price data once as a contiguous float64 buffer that every
+            # indicator shares without further conversion
+            prices = np.ascontiguousarray(df["price"].to_numpy(dtype=np.float64, copy=False))
             current_price = prices[-1]
             
-            # Calculate technical indicators
-            rsi = self.calculate_rsi(prices)
-            macd_result = self.calculate_macd(prices)
-            ma_result = self.check_moving_averages(prices)
-            sr_levels = self.identify_support_resistance(prices)
+            # Calculate technical indicators, incrementally when the data has
+            # only advanced by one bar since the previous call
+            stream = self._advance_stream(prices)
+            if stream is not None:
+                rsi = stream.rsi()
+                macd_result = stream.macd()
+                ma_result = stream.moving_averages()
+                self._stream_history = None
+            elif 26 + 9 <= len(prices) <= MACD_LOOP_MAX_LENGTH:
+                # Enough data for RSI and MACD (default slow + signal periods),
+                # and short enough for a Python loop: compute both in one pass
+                state = _recurrent_indicators(np.asarray(prices, dtype=np.float64).tolist())
+                rsi = _rsi_from_averages(state["avg_gain"], state["avg_loss"])
+                macd_result = {
+                    "macd_line": state["macd_line"],
+                    "signal_line": state["signal_line"],
+                    "histogram": state["histogram"],
+                    "signal": _macd_crossover(state["histogram"], state["previous_histogram"])
+                }
+                ma_result = self.check_moving_averages(prices)
+            else:
+                rsi = self.calculate_rsi(prices)
+                macd_result = self.calculate_macd(prices)
+                ma_result = self.check_moving_averages(prices)
             
-            # Determine buy/sell signals
-            buy_signals = 0
-            sell_signals = 0
+            if stream is None:
+                # Remember the history; the stream is fitted on it only if the
+                # next call turns out to be a one-bar update
+                self._stream = None
+                self._stream_history = prices
+            sr_levels = _support_resistance_levels(prices)
             
-            # RSI signals
+            # Attach the moving-average series so plot_price_chart can reuse them,
+            # with the length they were computed on to detect later changes
+            df["MA50"] = _rolling_mean(prices, 50)
+            df["MA200"] = _rolling_mean(prices, 200)
+            df.attrs["ma_length"] = len(df)
+            
+            # Collect the (indicator, signal) pairs
             if rsi < 30:
-                buy_signals += 1
+                rsi_state = "oversold"
             elif rsi > 70:
-                sell_signals += 1
-                
-            # MACD signals
-            if macd_result["signal"] == "buy":
-                buy_signals += 1
-            elif macd_result["signal"] == "sell":
-                sell_signals += 1
-                
-            # Moving average signals
-            if ma_result["signal"] == "golden_cross":
-                buy_signals += 2
-            elif ma_result["signal"] == "death_cross":
-                sell_signals += 2
-            elif ma_result["signal"] == "above":
-                buy_signals += 0.5
-            elif ma_result["signal"] == "below":
-                sell_signals += 0.5
+                rsi_state = "overbought"
+            else:
+                rsi_state = "neutral"
+            signals = [("rsi", rsi_state), ("macd", macd_result["signal"]), ("ma", ma_result["signal"])]
                 
             # Support/Resistance proximity
-            if sr_levels["support"] and min(abs(current_price - s) for s in sr_levels["support"]) / current_price < 0.05:
-                buy_signals += 0.5
-            if sr_levels["resistance"] and min(abs(current_price - r) for r in sr_levels["resistance"]) / current_price < 0.05:
-                sell_signals += 0.5
+            support = sr_levels["support"]
+            resistance = sr_levels["resistance"]
+            if support.size and np.abs(current_price - support).min() / current_price < 0.05:
+                signals.append(("sr", "near_support"))
+            if resistance.size and np.abs(current_price - resistance).min() / current_price < 0.05:
+                signals.append(("sr", "near_resistance"))
+            
+            # Determine buy/sell signals
+            buy_signals = sum(self._BUY_WEIGHTS.get(key, 0) for key in signals)
+            sell_signals = sum(self._SELL_WEIGHTS.get(key, 0) for key in signals)
                 
             # Generate recommendation
             if buy_signals >= 2 and buy_signals > sell_signals:
@@ -325,26 +953,23 @@ class ETHTechnicalAnalysis:
             else:
                 recommendation = "HOLD"
                 
-            # Compile explanation
+            # Compile explanation as (code, value) pairs
             explanation = []
             
-            if rsi < 30:
-                explanation.append(f"RSI is oversold ({rsi:.1f})")
-            elif rsi > 70:
-                explanation.append(f"RSI is overbought ({rsi:.1f})")
-            else:
-                explanation.append(f"RSI is neutral ({rsi:.1f})")
-                
-            explanation.append(f"MACD signal is {macd_result['signal']}")
+            explanation.append((f"rsi_{rsi_state}", rsi))
+            explanation.append(("macd", macd_result["signal"]))
             
             if ma_result["signal"] == "golden_cross":
-                explanation.append("Golden cross detected (bullish)")
+                explanation.append(("golden_cross", None))
             elif ma_result["signal"] == "death_cross":
-                explanation.append("Death cross detected (bearish)")
+                explanation.append(("death_cross", None))
             elif ma_result["signal"] == "above":
-                explanation.append(f"Price is above {ma_result['ma_long']:.2f} MA (bullish)")
+                explanation.append(("ma_above", float(ma_result["ma_long"])))
             elif ma_result["signal"] == "below":
-                explanation.append(f"Price is below {ma_result['ma_long']:.2f} MA (bearish)")
+                explanation.append(("ma_below", float(ma_result["ma_long"])))
+            
+            if verbose:
+                explanation = self.format_explanation(explanation)
                 
             # Compile results
             analysis_results = {
@@ -353,14 +978,23 @@ class ETHTechnicalAnalysis:
                 "macd_signal": macd_result["signal"],
                 "golden_cross": ma_result.get("golden_cross", False),
                 "death_cross": ma_result.get("death_cross", False),
-                "support_levels": sr_levels["support"],
-                "resistance_levels": sr_levels["resistance"],
+                "support_levels": support.tolist(),
+                "resistance_levels": resistance.tolist(),
                 "buy_score": buy_signals,
                 "sell_score": sell_signals,
                 "recommendation": recommendation,
                 "explanation": explanation
             }
             
+            # Cache the list values (levels, explanation) as tuples so no
+            # caller's edits can reach the cached copy
+            self._analysis_cache[cache_key] = {
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in analysis_results.items()
+            }
+            if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+            
             return analysis_results
             
         except Exception as e:
@@ -387,16 +1021,22 @@ class ETHTechnicalAnalysis:
             # Create figure and primary axis for price
             fig, ax1 = plt.subplots(figsize=(12, 8))
             
-            # Plot price
-            ax1.plot(df["timestamp"], df["price"], label="ETH Price", color="blue")
+            # Plot price, downsampled to what the chart can show
+            price_points = _lttb_indices(df["price"].to_numpy(dtype=np.float64), CHART_MAX_POINTS)
+            ax1.plot(df["timestamp"].to_numpy()[price_points], df["price"].to_numpy()[price_points],
+                     label="ETH Price", color="blue")
             ax1.set_xlabel("Date")
             ax1.set_ylabel("Price (USD)", color="blue")
             ax1.tick_params(axis="y", labelcolor="blue")
             
             if indicators:
-                # Calculate and plot moving averages
-                df["MA50"] = df["price"].rolling(window=50).mean()
-                df["MA200"] = df["price"].rolling(window=200).mean()
+                # Calculate and plot moving averages, unless analyze_price_data
+                # already attached them for this data
+                if ("MA50" not in df.columns or "MA200" not in df.columns
+                        or df.attrs.get("ma_length") != len(df)):
+                    engine = "numba" if NUMBA_AVAILABLE and len(df) >= NUMBA_ENGINE_MIN_LENGTH else None
+                    df["MA50"] = df["price"].rolling(window=50).mean(engine=engine)
+                    df["MA200"] = df["price"].rolling(window=200).mean(engine=engine)
                 
                 ax1.plot(df["timestamp"], df["MA50"], label="50-day MA",
 (Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
@@ -12,6 +12,7 @@ Date: April 16, 2025
 import os
 import argparse
 import json
+import shutil
 import subprocess
 import sys
 
@@ -21,178 +22,63 @@ DEFAULT_MACHINE_TYPE = "e2-micro"
 DEFAULT_ZONE = "us-central1-a"
 DEFAULT_IMAGE_FAMILY = "ubuntu-2004-lts"
 DEFAULT_IMAGE_PROJECT = "ubuntu-os-cloud"
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+STARTUP_SCRIPT_TEMPLATE = os.path.join(TEMPLATE_DIR, "startup-script.sh")
+CLOUD_FUNCTION_TEMPLATE = os.path.join(TEMPLATE_DIR, "cloud_function_main.py")
 
 def create_startup_script():
-    """Create a startup script for the VM instance"""
-    script = """#!/bin/bash
-# Startup script for ETH investment VM
-
-# Update system packages
-apt-get update
-apt-get upgrade -y
-
-# Install required packages
-apt-get install -y python3-pip python3-venv git
-
-# Create directory for the script
-mkdir -p /opt/eth-investment
-
-# Clone the repository or download files
-# git clone YOUR_REPO_URL /opt/eth-investment
-# OR
-# Create script files
-
-# Create virtual environment
-python3 -m venv /opt/eth-investment/venv
-source /opt/eth-investment/venv/bin/activate
-
-# Install required Python packages
-pip install pandas numpy matplotlib gspread oauth2client requests
-
-# Set up cron job for weekly analysis
-(crontab -l 2>/dev/null; echo "0 9 * * 1 cd /opt/eth-investment && /opt/eth-investment/venv/bin/python eth_investment_dashboard.py --run >> /var/log/eth-analysis.log 2>&1") | crontab -
-
-# Set up log rotation
-cat > /etc/logrotate.d/eth-investment << EOL
-/var/log/eth-analysis.log {
-    weekly
-    rotate 12
-    compress
-    delaycompress
-    missingok
-    notifempty
-    create 0640 root root
-}
-EOL
-
-# Create notification script
-cat > /opt/eth-investment/send_notification.py << EOL
-#!/usr/bin/env python3
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import os
-import sys
-
-def send_email_notification(subject, body, recipient):
-    # Email configuration - replace with your values or use environment variables
-    sender = os.environ.get("NOTIFICATION_EMAIL", "your-email@gmail.com")
-    password = os.environ.get("NOTIFICATION_PASSWORD", "your-app-password")
-    
-    # Create message
-    message = MIMEMultipart()
-    message["From"] = sender
-    message["To"] = recipient
-    message["Subject"] = subject
-    
-    # Add body
-    message.attach(MIMEText(body, "plain"))
+    """
+    Create a startup script for the VM instance
     
-    # Send email
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-        server.login(sender, password)
-        server.send_message(message)
-        
-    print(f"Email notification sent to {recipient}")
-
-if __name__ == "__main__":
-    if len(sys.argv) < 4:
-        print("Usage: python send_notification.py subject body recipient")
-        sys.exit(1)
-        
-    subject = sys.argv[1]
-    body = sys.argv[2]
-    recipient = sys.argv[3]
+    The script is kept verbatim in templates/startup-script.sh, so its shell
+    and embedded Python code need no escaping and are copied as-is.
     
-    send_email_notification(subject, body, recipient)
-EOL
-
-chmod +x /opt/eth-investment/send_notification.py
-
-# Create a wrapper script to run analysis and send notification
-cat > /opt/eth-investment/run_analysis_with_notification.sh << EOL
-#!/bin/bash
-cd /opt/eth-investment
-source venv/bin/activate
-python eth_investment_dashboard.py --run > analysis_output.txt
-if [ $? -eq 0 ]; then
-    python send_notification.py "ETH Analysis Complete" "$(cat analysis_output.txt)" "$NOTIFICATION_RECIPIENT"
-else
-    python send_notification.py "ETH Analysis Failed" "The ETH investment analysis script failed to run properly." "$NOTIFICATION_RECIPIENT"
-fi
-EOL
-
-chmod +x /opt/eth-investment/run_analysis_with_notification.sh
-
-# Create a health check script
-cat > /opt/eth-investment/health_check.py << EOL
-#!/usr/bin/env python3
-import os
-import time
-import datetime
-import sys
-
-def check_log_file(log_file, max_age_hours=25):
-    """Check if log file exists and has been updated recently"""
-    if not os.path.exists(log_file):
-        return False, "Log file does not exist"
-        
-    file_mod_time = os.path.getmtime(log_file)
-    current_time = time.time()
-    age_hours = (current_time - file_mod_time) / 3600
-    
-    if age_hours > max_age_hours:
-        return False, f"Log file is too old: {age_hours:.1f} hours"
+    Returns:
+        str: Path of the generated startup script
+    """
+    shutil.copyfile(STARTUP_SCRIPT_TEMPLATE, "startup-script.sh")
     
-    return True, f"Log file is recent: {age_hours:.1f} hours old"
+    print("Startup script created: startup-script.sh")
+    return "startup-script.sh"
 
-if __name__ == "__main__":
-    log_file = "/var/log/eth-analysis.log"
-    
-    # Check if script should have run recently (e.g., after Monday 9 AM)
-    today = datetime.datetime.now()
-    day_of_week = today.weekday()  # 0 is Monday
-    hour = today.hour
+def create_deployment_script(startup_script, instance_names=(DEFAULT_INSTANCE_NAME,),
+                             machine_type=DEFAULT_MACHINE_TYPE, zone=DEFAULT_ZONE):
+    """
+    Create a deployment script for Google Cloud
     
-    # If it's Monday after 9 AM or any later day in the week, log should be fresh
-    should_have_run = (day_of_week == 0 and hour >= 9) or day_of_week > 0
+    The generated script creates all VM instances in parallel background
+    shells and waits for them together, so deploying several instances takes
+    about as long as deploying one. Instance and operation names are saved to
+    eth_vm_state.json before waiting; with --no-wait the script returns right
+    after submitting the creates.
     
-    if should_have_run:
-        status, message = check_log_file(log_file)
-        print(message)
-        if not status:
-            sys.exit(1)
-    else:
-        print("No recent run expected yet")
+    Args:
+        startup_script (str): Path of the VM startup script
+        instance_names (list): Names of the VM instances to create
+        machine_type (str): Machine type for the VM instances
+        zone (str): Zone for the VM instances
         
-    sys.exit(0)
-EOL
-
-chmod +x /opt/eth-investment/health_check.py
-
-# Set up a daily health check
-(crontab -l 2>/dev/null; echo "0 12 * * * cd /opt/eth-investment && ./health_check.py || ./send_notification.py 'ETH Script Health Check Failed' 'The ETH investment script health check failed. Please check the VM.' '$NOTIFICATION_RECIPIENT'") | crontab -
-
-echo "ETH investment script setup complete"
-"""
-    
-    with open("startup-script.sh", "w") as f:
-        f.write(script)
-    
-    print("Startup script created: startup-script.sh")
-    return "startup-script.sh"
-
-def create_deployment_script(startup_script):
-    """Create a deployment script for Google Cloud"""
+    Returns:
+        str: Path of the deployment script
+    """
+    instance_list = " ".join(f'"{name}"' for name in instance_names)
     script = f"""#!/bin/bash
 # Google Cloud deployment script for ETH investment
 
 # Configuration - modify these variables
-INSTANCE_NAME="{DEFAULT_INSTANCE_NAME}"
-MACHINE_TYPE="{DEFAULT_MACHINE_TYPE}"
-ZONE="{DEFAULT_ZONE}"
+INSTANCE_NAMES=({instance_list})
+MACHINE_TYPE="{machine_type}"
+ZONE="{zone}"
 PROJECT_ID=$(gcloud config get-value project)
 STARTUP_SCRIPT="{startup_script}"
+STATE_FILE="eth_vm_state.json"
+BUNDLE_BUCKET="eth-investment-data-$PROJECT_ID"
+
+# Pass --no-wait to return as soon as the create requests are submitted
+WAIT_FOR_READY=1
+if [ "$1" == "--no-wait" ]; then
+    WAIT_FOR_READY=0
+fi
 
 # Check if gcloud is installed
 if ! command -v gcloud &> /dev/null; then
@@ -206,26 +92,88 @@ if [ -z "$PROJECT_ID" ]; then
     exit 1
 fi
 
-# Create the VM instance
-echo "Creating VM instance $INSTANCE_NAME..."
-gcloud compute instances create $INSTANCE_NAME \\
-    --machine-type=$MACHINE_TYPE \\
-    --zone=$ZONE \\
-    --image-family={DEFAULT_IMAGE_FAMILY} \\
-    --image-project={DEFAULT_IMAGE_PROJECT} \\
-    --metadata-from-file=startup-script=$STARTUP_SCRIPT \\
-    --scopes=https://www.googleapis.com/auth/cloud-platform \\
-    --tags=http-server,https-server
-
-# Get the external IP
-EXTERNAL_IP=$(gcloud compute instances describe $INSTANCE_NAME --zone=$ZONE --format='get(networkInterfaces[0].accessConfigs[0].natIP)')
-
-echo "VM instance created with IP: $EXTERNAL_IP"
+# Create the VM instances in parallel; each create is network-bound. The
+# requests return immediately (--async) with the name of their operation.
+OPERATIONS_DIR=$(mktemp -d)
+CREATE_NAMES=()
+CREATE_PIDS=()
+for INSTANCE_NAME in "${{INSTANCE_NAMES[@]}}"; do
+    echo "Creating VM instance $INSTANCE_NAME..."
+    gcloud compute instances create $INSTANCE_NAME \\
+        --async \\
+        --format='value(name)' \\
+        --machine-type=$MACHINE_TYPE \\
+        --zone=$ZONE \\
+        --image-family={DEFAULT_IMAGE_FAMILY} \\
+        --image-project={DEFAULT_IMAGE_PROJECT} \\
+        --metadata-from-file=startup-script=$STARTUP_SCRIPT \\
+        --scopes=https://www.googleapis.com/auth/cloud-platform \\
+        --tags=http-server,https-server > "$OPERATIONS_DIR/$INSTANCE_NAME" &
+    CREATE_NAMES+=("$INSTANCE_NAME")
+    CREATE_PIDS+=($!)
+done
+
+# Wait for all create requests and report any that failed
+FAILED=0
+for i in "${{!CREATE_PIDS[@]}}"; do
+    if ! wait ${{CREATE_PIDS[$i]}}; then
+        echo "Failed to create VM instance ${{CREATE_NAMES[$i]}}"
+        FAILED=1
+    fi
+done
+
+# Persist every submitted instance and its operation before waiting on
+# anything, so an interrupted deployment never leaves an untracked VM behind
+{{
+    echo "{{"
+    echo "  \\"zone\\": \\"$ZONE\\","
+    echo "  \\"instances\\": ["
+    SEPARATOR=""
+    for INSTANCE_NAME in "${{INSTANCE_NAMES[@]}}"; do
+        OPERATION=$(cat "$OPERATIONS_DIR/$INSTANCE_NAME" 2>/dev/null)
+        if [ -n "$OPERATION" ]; then
+            printf '%s    {{"name": "%s", "operation": "%s"}}' "$SEPARATOR" "$INSTANCE_NAME" "$OPERATION"
+            SEPARATOR=$',\\n'
+        fi
+    done
+    printf '\\n  ]\\n}}\\n'
+}} > "$STATE_FILE"
+OPERATIONS=$(echo $(cat "$OPERATIONS_DIR"/* 2>/dev/null))
+rm -rf "$OPERATIONS_DIR"
+echo "Instance and operation names saved to $STATE_FILE"
+
+if [ $FAILED -ne 0 ]; then
+    exit 1
+fi
+
+if [ $WAIT_FOR_READY -eq 0 ]; then
+    echo "Create requests submitted. To wait for the instances to be ready, run:"
+    echo "gcloud compute operations wait $OPERATIONS --zone=$ZONE"
+    exit 0
+fi
+
+# Wait on the create operations with the server-side long-poll, which returns
+# as soon as they finish instead of after a client-side polling interval
+if ! gcloud compute operations wait $OPERATIONS --zone=$ZONE; then
+    echo "VM instance creation did not complete successfully"
+    exit 1
+fi
+
+# Get the external IPs of all instances in a single call
+echo "VM instances created:"
+gcloud compute instances list \\
+    --filter="name=( ${{INSTANCE_NAMES[*]}} )" \\
+    --zones=$ZONE \\
+    --format='table(name,networkInterfaces[0].accessConfigs[0].natIP:label=EXTERNAL_IP)'
+
+INSTANCE_NAME="${{INSTANCE_NAMES[0]}}"
 echo "Setup is running in the background. You can check the status with:"
 echo "gcloud compute ssh $INSTANCE_NAME --zone=$ZONE --command='sudo tail -f /var/log/syslog'"
 
-echo "To upload your ETH investment script files, use:"
-echo "gcloud compute scp --recurse /path/to/local/script/files/* $INSTANCE_NAME:/opt/eth-investment/ --zone=$ZONE"
+echo "To upload your ETH investment script files, stage them in Cloud Storage with parallel"
+echo "transfers and pull them onto the VM (faster than scp for many small files):"
+echo "gsutil -m cp /path/to/local/script/files/eth_*.py gs://$BUNDLE_BUCKET/eth-bundle/"
+echo "gcloud compute ssh $INSTANCE_NAME --zone=$ZONE --command='sudo gsutil -m cp gs://$BUNDLE_BUCKET/eth-bundle/* /opt/eth-investment/'"
 
 echo "To set notification email, connect to the VM and run:"
 echo "gcloud compute ssh $INSTANCE_NAME --zone=$ZONE"
@@ -248,393 +196,15 @@ def create_cloud_function_files():
     os.makedirs("cloud-functions", exist_ok=True)
     
     # Create main.py for the Cloud Function
-    main_py = """
-import base64
-import json
-import os
-import tempfile
-import traceback
-from google.cloud import storage
-from datetime import datetime
-
-# Import our ETH investment modules
-# Note: These need to be included in the deployment package
-from eth_price_tracker import ETHPriceTracker
-from eth_technical_analysis import ETHTechnicalAnalysis
-from eth_investment_advisor import ETHInvestmentAdvisor
-from eth_risk_manager import ETHRiskManager
-from eth_performance_tracker import ETHPerformanceTracker
-
-# Configuration
-BUCKET_NAME = os.environ.get('STORAGE_BUCKET', 'eth-investment-data')
-CONFIG_FILE = os.environ.get('CONFIG_FILE', 'eth_config.json')
-NOTIFICATION_TOPIC = os.environ.get('NOTIFICATION_TOPIC', 'eth-investment-notifications')
-
-def run_eth_analysis(event, context):
-    """
-    Cloud Function to run ETH investment analysis
-    
-    Args:
-        event (dict): Event payload
-        context (google.cloud.functions.Context): Event context
-    
-    Returns:
-        dict: Analysis results
-    """
-    try:
-        print(f"Starting ETH investment analysis at {datetime.now().isoformat()}")
-        
-        # Initialize storage client
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(BUCKET_NAME)
-        
-        # Download configuration if it exists
-        config = {}
-        config_blob = bucket.blob(CONFIG_FILE)
-        if config_blob.exists():
-            with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-                config_blob.download_to_filename(temp_file.name)
-                with open(temp_file.name, 'r') as f:
-                    config = json.load(f)
-                os.unlink(temp_file.name)
-        
-        # Initialize modules
-        price_tracker = ETHPriceTracker()
-        analyzer = ETHTechnicalAnalysis()
-        advisor = ETHInvestmentAdvisor(risk_tolerance=config.get('risk_tolerance', 'medium'))
-        risk_manager = ETHRiskManager(
-            portfolio_value=config.get('portfolio_value', 10000),
-            max_risk_per_trade=config.get('max_risk_per_trade', 0.02),
-            max_portfolio_exposure=config.get('max_portfolio_exposure', 0.25)
-        )
-        
-        # Load trade history from storage
-        trades_file = 'eth_trades.json'
-        trades_blob = bucket.blob(trades_file)
-        trades_data = []
-        if trades_blob.exists():
-            with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-                trades_blob.download_to_filename(temp_file.name)
-                with open(temp_file.name, 'r') as f:
-                    trades_data = json.load(f)
-                os.unlink(temp_file.name)
-        
-        # Load decisions history from storage
-        decisions_file = 'eth_decisions.json'
-        decisions_blob = bucket.blob(decisions_file)
-        decisions_data = []
-        if decisions_blob.exists():
-            with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-                decisions_blob.download_to_filename(temp_file.name)
-                with open(temp_file.name, 'r') as f:
-                    decisions_data = json.load(f)
-                os.unlink(temp_file.name)
-        
-        # Initialize performance tracker with loaded data
-        performance_tracker = ETHPerformanceTracker()
-        performance_tracker.trades = trades_data
-        performance_tracker.decisions = decisions_data
-        
-        # Get current price data
-        current_data = price_tracker.get_current_price()
-        if not current_data:
-            raise Exception("Failed to get current price data")
-            
-        current_price = current_data.get('price', 0)
-        print(f"Current ETH Price: ${current_price:.2f}")
-        
-        # Get historical price data
-        historical_prices = price_tracker.get_historical_prices(days=90)
-        if historical_prices.empty:
-            raise Exception("Failed to get historical price data")
-            
-        print(f"Retrieved {len(historical_prices)} days of historical data")
-        
-        # Perform technical analysis
-        analysis_results = analyzer.analyze_price_data(historical_prices)
-        if not analysis_results:
-            raise Exception("Failed to perform technical analysis")
-            
-        print(f"Technical Analysis Recommendation: {analysis_results.get('recommendation', 'UNKNOWN')}")
-        
-        # Generate investment recommendation
-        recommendation = advisor.generate_recommendation(analysis_results, historical_prices)
-        if not recommendation:
-            raise Exception("Failed to generate investment recommendation")
-            
-        print(f"Investment Recommendation: {recommendation.get('recommendation', 'UNKNOWN')}")
-        
-        # Generate risk management report
-        risk_report = risk_manager.generate_risk_report(current_price, current_price, historical_prices)
-        if not risk_report:
-            raise Exception("Failed to generate risk management report")
-        
-        # Generate performance report
-        performance_report = performance_tracker.generate_performance_report(current_price)
-        if not performance_report:
-            raise Exception("Failed to generate performance report")
-        
-        # Record the decision
-        decision = performance_tracker.record_decision(
-            recommendation.get('recommendation', 'UNKNOWN'),
-            current_price,
-            analysis_results
-        )
-        
-        # Save updated decisions back to storage
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-            json.dump(performance_tracker.decisions, temp_file)
-            temp_file.flush()
-            decisions_blob.upload_from_filename(temp_file.name)
-            os.unlink(temp_file.name)
-        
-        # Compile results
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'price_data': current_data,
-            'analysis': analysis_results,
-            'recommendation': recommendation,
-            'risk_report': risk_report,
-            'performance': performance_report
-        }
-        
-        # Save results to storage
-        results_file = f'eth_analysis_{datetime.now().strftime("%Y%m%d")}.json'
-        results_blob = bucket.blob(results_file)
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-            json.dump(results, temp_file)
-            temp_file.flush()
-            results_blob.upload_from_filename(temp_file.name)
-            os.unlink(temp_file.name)
-        
-        # Generate beginner-friendly summary
-        summary = generate_beginner_friendly_summary(results)
-        
-        # Save summary to storage
-        summary_file = f'eth_summary_{datetime.now().strftime("%Y%m%d")}.txt'
-        summary_blob = bucket.blob(summary_file)
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-            temp_file.write(summary)
-            temp_file.flush()
-            summary_blob.upload_from_filename(temp_file.name)
-            os.unlink(temp_file.name)
-        
-        # Send notification (implementation depends on your notification method)
-        send_notification(
-            subject=f"ETH Analysis: {recommendation.get('recommendation', 'UNKNOWN')}",
-            message=summary,
-            results=results
-        )
-        
-        print(f"ETH investment analysis completed successfully at {datetime.now().isoformat()}")
-        return results
-        
-    except Exception as e:
-        error_message = f"Error in ETH analysis: {str(e)}\\n{traceback.format_exc()}"
-        print(error_message)
-        
-        # Send error notification
-        try:
-            send_notification(
-                subject="ETH Analysis Error",
-                message=error_message,
-                results=None
-            )
-        except Exception as notify_error:
-            print(f"Failed to send error notification: {str(notify_error)}")
-        
-        # Re-raise the exception for Cloud Functions logging
-        raise
-
-def generate_beginner_friendly_summary(results):
-    """Generate a beginner-friendly summary of analysis results"""
-    try:
-        if not results:
-            return "Error: No analysis results available"
-            
-        summary = []
-        
-        # Add header
-        summary.append("=" * 60)
-        summary.append("ETH INVESTMENT SUMMARY - BEGINNER'S GUIDE")
-        summary.append("=" * 60)
-        summary.append("")
-        
-        # Add current price information
-        if "price_data" in results:
-            price_data = results["price_data"]
-            summary.append(f"Current ETH Price: ${price_data.get('price', 0):.2f}")
-            
-            change_24h = price_data.get('change_24h', 0)
-            if change_24h > 0:
-                summary.append(f"24-hour Change: 📈 +{change_24h:.2f}% (Up)")
-            else:
-                summary.append(f"24-hour Change: 📉 {change_24h:.2f}% (Down)")
-                
-            summary.append("")
-        
-        # Add recommendation
-        if "recommendation" in results:
-            recommendation = results["recommendation"]
-            rec_text = recommendation.get("recommendation", "UNKNOWN")
-            
-            summary.append("WHAT SHOULD YOU DO?")
-            summary.append("-" * 60)
-            
-            if rec_text == "STRONG BUY":
-                summary.append("🟢 STRONG BUY - Technical indicators strongly suggest buying ETH now")
-            elif rec_text == "BUY":
-                summary.append("🟢 BUY - Technical indicators suggest buying ETH now")
-            elif rec_text == "HOLD":
-                summary.append("🟡 HOLD - Technical indicators suggest holding your current position")
-            elif rec_text == "SELL":
-                summary.append("🔴 SELL - Technical indicators suggest selling ETH now")
-            elif rec_text == "STRONG SELL":
-                summary.append("🔴 STRONG SELL - Technical indicators strongly suggest selling ETH now")
-            else:
-                summary.append(f"⚪ {rec_text} - Please check the detailed analysis")
-            
-            summary.append("")
-            summary.append("Recommended Action:")
-            summary.append(recommendation.get("action", "No specific action recommended"))
-            summary.append("")
-            
-            # Add explanation in simple terms
-            summary.append("WHY THIS RECOMMENDATION?")
-            summary.append("-" * 60)
-            
-            for explanation in recommendation.get("explanations", []):
-                if explanation:
-                    summary.append(f"• {explanation}")
-            
-            summary.append("")
-        
-        # Add risk management in simple terms
-        if "risk_report" in results:
-            risk_report = results["risk_report"]
-            
-            summary.append("RISK MANAGEMENT")
-            summary.append("-" * 60)
-            
-            # Stop-loss
-            if "stop_loss" in risk_report:
-                stop_loss = risk_report["stop_loss"]
-                recommended_method = stop_loss.get("recommended_method", "")
-                
-                if recommended_method and recommended_method in stop_loss.get("methods", {}):
-                    stop_price = stop_loss["methods"][recommended_method].get("stop_price", 0)
-                    
-                    summary.append(f"Stop-Loss Price: ${stop_price:.2f}")
-                    summary.append("(This is the price at which you should sell to limit potential losses)")
-                    summary.append("")
-            
-            # Position size
-            if "position_size" in risk_report:
-                position_size = risk_report["position_size"]
-                
-                summary.append("If you decide to buy ETH:")
-                summary.append(f"• Recommended Amount: {position_size.get('position_size_coins', 0):.4f} ETH")
-                summary.append(f"• Approximate Cost: ${position_size.get('position_size_dollars', 0):.2f}")
-                summary.append(f"• This represents {position_size.get('portfolio_percentage', 0) * 100:.1f}% of your portfolio")
-                summary.append("")
-        
-        # Add performance summary
-        if "performance" in results and "portfolio" in results["performance"]:
-            portfolio = results["performance"]["portfolio"]
-            
-            summary.append("YOUR PORTFOLIO PERFORMANCE")
-            summary.append("-" * 60)
-            
-            eth_balance = portfolio.get('eth_balance', 0)
-            if eth_balance > 0:
-                summary.append(f"Current ETH Holdings: {eth_balance:.4f} ETH (${portfolio.get('current_value', 0):.2f})")
-                
-                total_pl = portfolio.get('total_pl', 0)
-                roi = portfolio.get('roi', 0) * 100
-                
-                if total_pl >= 0:
-                    summary.append(f"Total Profit: ${total_pl:.2f} (ROI: {roi:.1f}%)")
-                else:
-                    summary.append(f"Total Loss: ${total_pl:.2f} (ROI: {roi:.1f}%)")
-            else:
-                summary.append("You don't have any ETH holdings recorded yet.")
-                summary.append("Use this tool to track your investments once you start buying ETH.")
-            
-            summary.append("")
-        
-        # Add footer with next steps
-        summary.append("NEXT STEPS")
-        summary.append("-" * 60)
-        summary.append("1. Review the recommendation and decide if you want to take action")
-        summary.append("2. If buying, consider using the recommended position size")
-        summary.append("3. If selling, consider the tax implications of your sale")
-        summary.append("4. Always set a stop-loss to protect your investment")
-        summary.append("5. Check back next week for an updated analysis")
-        summary.append("")
-        
-        # Add disclaimer
-        summary.append("DISCLAIMER")
-        summary.append("-" * 60)
-        summary.append("This is an automated analysis based on technical indicators.")
-        summary.append("It should not be considered financial advice.")
-        summary.append("Always do your own research before making investment decisions.")
-        summary.append("=" * 60)
-        
-        return "\\n".join(summary)
-    except Exception as e:
-        print(f"Error generating beginner-friendly summary: {str(e)}")
-        return f"Error generating summary: {str(e)}"
-
-def send_notification(subject, message, results=None):
-    """
-    Send notification with analysis results
-    
-    This is a placeholder function. Implement your preferred notification method:
-    - Pub/Sub
-    - SendGrid
-    - SMTP email
-    - Twilio SMS
-    - etc.
-    """
-    # Example using Pub/Sub (you would need to set up a Pub/Sub topic and subscriber)
-    try:
-        from google.cloud import pubsub_v1
-        
-        publisher = pubsub_v1.PublisherClient()
-        topic_path = publisher.topic_path(
-            os.environ.get('PROJECT_ID', 'your-project-id'),
-            NOTIFICATION_TOPIC
-        )
-        
-        # Create message data
-        data = {
-            'subject': subject,
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Add results if available
-        if results:
-            data['results'] = results
-        
-        # Convert to JSON and publish
-        data_bytes = json.dumps(data).encode('utf-8')
-        publisher.publish(topic_path, data=data_bytes)
-        
-        print(f"Notification sent to topic: {NOTIFICATION_TOPIC}")
-        return True
-    except Exception as e:
-        print(f"Error sending notification: {str(e)}")
-        return False
-"""
-    
-    with open(os.path.join("cloud-functions", "main.py"), "w") as f:
-        f.write(main_py)
+    shutil.copyfile(CLOUD_FUNCTION_TEMPLATE, os.path.join("cloud-functions", "main.py"))
     
-    # Create requirements.txt
+    # Create requirements.txt. matplotlib is still needed: the tracker and
+    # analysis modules import it at module level, even though the function
+    # never renders a chart (it runs with the headless Agg backend)
     requirements = """
 google-cloud-storage>=2.0.0
 google-cloud-pubsub>=2.0.0
+orjson>=3.6.0
 pandas>=1.3.0
 numpy>=1.20.0
 matplotlib>=3.4.0
@@ -700,7 +270,7 @@ gcloud functions deploy $FUNCTION_NAME \\
     --trigger-topic=run-eth-analysis \\
     --memory=512MB \\
     --timeout=540s \\
-    --set-env-vars=STORAGE_BUCKET=$BUCKET_NAME,NOTIFICATION_TOPIC=$TOPIC_NAME,PROJECT_ID=$PROJECT_ID
+    --set-env-vars=STORAGE_BUCKET=$BUCKET_NAME,NOTIFICATION_TOPIC=$TOPIC_NAME,PROJECT_ID=$PROJECT_ID,GOOGLE_CLOUD_PROJECT=$PROJECT_ID,MPLBACKEND=Agg
 
 # Create Cloud Scheduler job
 JOB_NAME="weekly-eth-analysis"
@@ -758,7 +328,8 @@ def create_notification_subscriber():
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description="Google Cloud Deployment Setup for ETH Investment Script")
-    parser.add_argument("--instance-name", default=DEFAULT_INSTANCE_NAME, help="Name for the VM instance")
+    parser.add_argument("--instance-name", default=DEFAULT_INSTANCE_NAME,
+                        help="Name for the VM instance (comma-separated names create several in parallel)")
     parser.add_argument("--machine-type", default=DEFAULT_MACHINE_TYPE, help="Machine type for the VM instance")
     parser.add_argument("--zone", default=DEFAULT_ZONE, help="Zone for the VM instance")
     args = parser.parse_args()
@@ -769,7 +340,12 @@ def main():
     startup_script = create_startup_script()
     
     # Create deployment script
-    deployment_script = create_deployment_script(startup_script)
+    deployment_script = create_deployment_script(
+        startup_script,
+        instance_names=args.instance_name.split(","),
+        machine_type=args.machine_type,
+        zone=args.zone
+    )
     
     # Create Cloud Function files
     cloud_function_dir = create_cloud_function_files()
@@ -10,21 +10,37 @@ Date: April 16, 2025
 """
 
 import os
+import gzip
 import json
+import math
+import time
+import hashlib
 import datetime
 import logging
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, g
 from google.cloud import storage
 from google.cloud import pubsub_v1
 import google.oauth2.id_token
 from google.auth.transport import requests as google_requests
-import tempfile
-import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+from google.api_core.exceptions import NotFound, PreconditionFailed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import io
-import base64
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library parser is used instead
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; charts then parse the whole analysis
+    ijson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,131 +54,510 @@ app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
 PROJECT_ID = os.environ.get('GOOGLE_CLOUD_PROJECT', 'your-project-id')
 BUCKET_NAME = os.environ.get('STORAGE_BUCKET', 'eth-investment-data')
 TOPIC_NAME = os.environ.get('NOTIFICATION_TOPIC', 'eth-investment-notifications')
+BLOB_CACHE_SIZE = 32
+CHART_CACHE_SIZE = 8
+# Horizontal resolution of the rendered chart (10 in at 100 dpi); longer
+# series are reduced to at most four points per pixel column before plotting
+CHART_WIDTH_PX = 1000
+TOKEN_CACHE_SIZE = 256
+# Verified tokens are reused only until this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 30
+# How long browsers may reuse an API response before revalidating its ETag
+API_CACHE_MAX_AGE = 30
+# Endpoints reachable without signing in; every other route requires a user
+PUBLIC_ENDPOINTS = {'login', 'logout', 'session_login', 'static'}
+# Attempts at appending a trade when other writers keep changing the shard
+TRADE_WRITE_ATTEMPTS = 3
+# Text responses at least this large are gzip-compressed for clients that accept it
+COMPRESS_MIN_SIZE = 500
+COMPRESS_LEVEL = 5
+COMPRESS_MIMETYPES = {'application/json', 'text/html', 'text/css', 'application/javascript', 'image/svg+xml'}
+# Trades recorded before sharding live in one JSON array; newer trades are
+# appended to one JSON Lines shard per day
+TRADES_BLOB = 'eth_trades.json'
+TRADE_SHARD_PREFIX = 'eth_trades/'
+HISTORY_DOWNLOAD_WORKERS = 8
+# Copy of the newest analysis written by the Cloud Function next to the dated file
+LATEST_ANALYSIS_BLOB = 'eth_latest_analysis.json'
+# Current price written alongside it, so pages needing only the price skip the full analysis
+CURRENT_PRICE_BLOB = 'eth_current_price.json'
+# Only the metadata the dashboard uses is requested when listing the bucket
+LIST_FIELDS = 'items(name,generation),nextPageToken'
 
 # Initialize Google Cloud clients
 storage_client = storage.Client()
-publisher = pubsub_v1.PublisherClient()
-firebase_request_adapter = google_requests.Request()
+# Publishes are batched in the background for up to 50 ms, so concurrent
+# triggers share one request
+publisher = pubsub_v1.PublisherClient(
+    batch_settings=pubsub_v1.types.BatchSettings(
+        max_messages=100, max_bytes=1024 * 1024, max_latency=0.05))
+
+# Keep-alive connection pool for fetching Firebase's public signing keys, so
+# token verification does not open a new TLS connection each time
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.1)))
+firebase_request_adapter = google_requests.Request(session=http_session)
+
+# Parsed JSON blobs and rendered charts keyed by (blob name, generation),
+# most recently used last
+_blob_cache = OrderedDict()
+_chart_cache = OrderedDict()
+# Verified Firebase token claims keyed by a digest of the token
+_token_cache = OrderedDict()
+_cache_lock = threading.Lock()
 
 # Helper functions
+def cache_lookup(cache, key):
+    """Return the cached value for key (or None), marking it most recently used"""
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    return None
+
+def cache_store(cache, key, value, max_size):
+    """Store value under key, evicting the least recently used entry when full"""
+    with _cache_lock:
+        cache[key] = value
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+def verify_id_token(id_token):
+    """
+    Verify a Firebase ID token, reusing the claims of tokens verified earlier
+    
+    Args:
+        id_token (str): Firebase ID token
+        
+    Returns:
+        dict: Token claims
+        
+    Raises:
+        ValueError: If the token is invalid or expired
+    """
+    key = hashlib.blake2b(id_token.encode('utf-8'), digest_size=16).digest()
+    claims = cache_lookup(_token_cache, key)
+    if claims is not None and time.time() < claims.get('exp', 0) - TOKEN_EXPIRY_MARGIN:
+        return claims
+    
+    claims = google.oauth2.id_token.verify_firebase_token(
+        id_token, firebase_request_adapter)
+    cache_store(_token_cache, key, claims, TOKEN_CACHE_SIZE)
+    return claims
+
 def get_current_user():
-    """Get the current user from the session"""
+    """Get the current user from the session, verifying the token at most once per request"""
+    if 'current_user' in g:
+        return g.current_user
+    
+    user = None
     id_token = session.get('id_token')
     if id_token:
         try:
-            claims = google.oauth2.id_token.verify_firebase_token(
-                id_token, firebase_request_adapter)
-            return claims
+            user = verify_id_token(id_token)
         except ValueError as exc:
             logger.error(f"Error verifying token: {exc}")
+    g.current_user = user
+    return user
+
+def json_loads(data):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(data):
+    """Serialize data to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+def json_response(data):
+    """Build a JSON response without going through jsonify's pretty-printing encoder"""
+    return app.response_class(json_dumps(data), mimetype='application/json')
+
+def conditional_json_response(blobs, load):
+    """
+    Build a JSON response for content stored in blobs, honoring If-None-Match
+    
+    The ETag is derived from the names and generations of the blobs, so it is
+    known before anything is downloaded and a revalidation costs no download.
+    
+    Args:
+        blobs (list): Blobs the content is read from, with their metadata loaded
+        load (callable): Function returning the content to serialize
+        
+    Returns:
+        flask.Response: 304 response if the client's copy is current, else the JSON content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for blob in blobs:
+        digest.update(f"{blob.name}:{blob.generation};".encode('utf-8'))
+    etag = digest.hexdigest()
+    
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = json_response(load())
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = f'private, max-age={API_CACHE_MAX_AGE}'
+    return response
+
+def json_lines_loads(data):
+    """Parse JSON Lines bytes into a list, skipping blank lines"""
+    return [json_loads(line) for line in data.splitlines() if line.strip()]
+
+def load_blob_json(blob, parser=json_loads):
+    """
+    Download and parse a JSON blob, reusing the parsed content while the blob is unchanged
+    
+    Every upload gives a blob a new generation, so an entry keyed by name and
+    generation can never be stale. Callers must not modify the returned value.
+    
+    Args:
+        blob (google.cloud.storage.Blob): Blob with its metadata loaded
+        parser (callable): Function turning the downloaded bytes into content
+        
+    Returns:
+        Parsed JSON content
+    """
+    key = (blob.name, blob.generation)
+    content = cache_lookup(_blob_cache, key)
+    if content is not None:
+        return content
+    
+    content = parser(blob.download_as_bytes())
+    
+    if blob.generation is not None:
+        cache_store(_blob_cache, key, content, BLOB_CACHE_SIZE)
+    return content
+
+def list_latest_analysis_blobs(bucket, limit):
+    """
+    List the newest analysis blobs without materializing the whole listing
+    
+    Analysis files are named by date and listed in ascending name order, so
+    only the last `limit` entries are kept while paging through the listing.
+    
+    Args:
+        bucket (google.cloud.storage.Bucket): Bucket with the analysis files
+        limit (int): Maximum number of blobs to return
+        
+    Returns:
+        list: Analysis blobs, newest first
+    """
+    newest = deque(bucket.list_blobs(prefix='eth_analysis_', fields=LIST_FIELDS), maxlen=limit)
+    newest.reverse()
+    return list(newest)
+
+def find_latest_analysis_blob(bucket):
+    """
+    Find the blob holding the latest analysis, with its metadata loaded
+    
+    Args:
+        bucket (google.cloud.storage.Bucket): Bucket with the analysis files
+        
+    Returns:
+        google.cloud.storage.Blob: Latest analysis blob, or None if there is none
+    """
+    # Read the latest-analysis copy directly; only buckets written before
+    # it existed fall back to listing every analysis file
+    latest_blob = bucket.get_blob(LATEST_ANALYSIS_BLOB)
+    if latest_blob is None:
+        blobs = list_latest_analysis_blobs(bucket, 1)
+        if not blobs:
+            logger.warning("No analysis files found in bucket")
             return None
-    return None
+        latest_blob = blobs[0]
+    return latest_blob
 
 def get_latest_analysis():
     """Get the latest ETH analysis results from Cloud Storage"""
     try:
         bucket = storage_client.bucket(BUCKET_NAME)
-        
-        # Find the latest analysis file
-        blobs = list(bucket.list_blobs(prefix='eth_analysis_'))
-        if not blobs:
-            logger.warning("No analysis files found in bucket")
+        latest_blob = find_latest_analysis_blob(bucket)
+        if latest_blob is None:
             return None
-            
-        # Sort by name (which includes date) in descending order
-        blobs.sort(key=lambda x: x.name, reverse=True)
-        latest_blob = blobs[0]
         
         # Download the latest analysis
-        with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-            latest_blob.download_to_filename(temp_file.name)
-            with open(temp_file.name, 'r') as f:
-                analysis = json.load(f)
-            os.unlink(temp_file.name)
-            
-        return analysis
+        return load_blob_json(latest_blob)
     except Exception as e:
         logger.error(f"Error getting latest analysis: {e}")
         return None
 
+def load_historical_prices(blob):
+    """
+    Get the historical price records of an analysis blob
+    
+    An analysis already in the blob cache is reused. Otherwise, when ijson is
+    installed, only the historical_prices array is parsed from the download
+    rather than the whole document.
+    
+    Args:
+        blob (google.cloud.storage.Blob): Analysis blob with its metadata loaded
+        
+    Returns:
+        list: Price records, or None if the analysis has none
+    """
+    analysis = cache_lookup(_blob_cache, (blob.name, blob.generation))
+    if analysis is None and ijson is not None:
+        records = ijson.items(io.BytesIO(blob.download_as_bytes()), 'historical_prices.item', use_float=True)
+        return list(records) or None
+    if analysis is None:
+        analysis = load_blob_json(blob)
+    return analysis.get('historical_prices')
+
+def get_latest_price_chart():
+    """Get the SVG chart of the latest analysis, rendering it once per analysis blob"""
+    try:
+        bucket = storage_client.bucket(BUCKET_NAME)
+        latest_blob = find_latest_analysis_blob(bucket)
+        if latest_blob is None:
+            return None
+        
+        key = (latest_blob.name, latest_blob.generation)
+        chart = cache_lookup(_chart_cache, key)
+        if chart is not None:
+            return chart
+        
+        historical_prices = load_historical_prices(latest_blob)
+        if historical_prices is None:
+            return None
+        
+        chart = generate_price_chart(historical_prices)
+        if chart is not None and latest_blob.generation is not None:
+            cache_store(_chart_cache, key, chart, CHART_CACHE_SIZE)
+        return chart
+    except Exception as e:
+        logger.error(f"Error getting price chart: {e}")
+        return None
+
+def get_current_price():
+    """Get the current ETH price from the latest analysis run (0 if unavailable)"""
+    try:
+        bucket = storage_client.bucket(BUCKET_NAME)
+        try:
+            price_data = json_loads(bucket.blob(CURRENT_PRICE_BLOB).download_as_bytes())
+        except NotFound:
+            # Written by older analysis runs only as part of the full analysis
+            price_data = (get_latest_analysis() or {}).get('price_data') or {}
+        return price_data.get('price') or 0
+    except Exception as e:
+        logger.error(f"Error getting current price: {e}")
+        return 0
+
 def get_historical_analyses(limit=10):
     """Get historical ETH analyses from Cloud Storage"""
     try:
         bucket = storage_client.bucket(BUCKET_NAME)
         
-        # Find all analysis files
-        blobs = list(bucket.list_blobs(prefix='eth_analysis_'))
+        # Find the newest analysis files
+        blobs = list_latest_analysis_blobs(bucket, limit)
         if not blobs:
             logger.warning("No analysis files found in bucket")
             return []
-            
-        # Sort by name (which includes date) in descending order
-        blobs.sort(key=lambda x: x.name, reverse=True)
-        
-        # Limit the number of analyses
-        blobs = blobs[:limit]
-        
-        # Download and parse each analysis
-        analyses = []
-        for blob in blobs:
-            with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-                blob.download_to_filename(temp_file.name)
-                with open(temp_file.name, 'r') as f:
-                    analysis = json.load(f)
-                os.unlink(temp_file.name)
-                analyses.append(analysis)
+        
+        # Download and parse the analyses concurrently; map keeps the newest-first order
+        with ThreadPoolExecutor(max_workers=min(HISTORY_DOWNLOAD_WORKERS, len(blobs))) as executor:
+            analyses = list(executor.map(load_blob_json, blobs))
                 
         return analyses
     except Exception as e:
         logger.error(f"Error getting historical analyses: {e}")
         return []
 
+def list_trade_blobs(bucket):
+    """
+    List the blobs holding the trade history, oldest first
+    
+    get_blob and list_blobs return the metadata (including the generation),
+    so unchanged files are served from the blob cache.
+    
+    Args:
+        bucket (google.cloud.storage.Bucket): Bucket with the trade files
+        
+    Returns:
+        list: The original trades blob (if any) followed by the daily shards
+    """
+    blobs = []
+    trades_blob = bucket.get_blob(TRADES_BLOB)
+    if trades_blob is not None:
+        blobs.append(trades_blob)
+    blobs.extend(bucket.list_blobs(prefix=TRADE_SHARD_PREFIX, fields=LIST_FIELDS))
+    return blobs
+
+def load_trades(blobs):
+    """Parse and concatenate the trades stored in the blobs from list_trade_blobs"""
+    trades = []
+    for blob in blobs:
+        parser = json_loads if blob.name == TRADES_BLOB else json_lines_loads
+        trades.extend(load_blob_json(blob, parser=parser))
+    return trades
+
 def get_trade_history():
     """Get ETH trade history from Cloud Storage"""
     try:
         bucket = storage_client.bucket(BUCKET_NAME)
-        trades_blob = bucket.blob('eth_trades.json')
+        trades = load_trades(list_trade_blobs(bucket))
         
-        if not trades_blob.exists():
+        if not trades:
             logger.warning("No trade history found in bucket")
-            return []
-            
-        with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-            trades_blob.download_to_filename(temp_file.name)
-            with open(temp_file.name, 'r') as f:
-                trades = json.load(f)
-            os.unlink(temp_file.name)
             
         return trades
     except Exception as e:
         logger.error(f"Error getting trade history: {e}")
         return []
 
+def summarize_trades(trades, current_price):
+    """
+    Compute the portfolio totals shown on the performance page
+    
+    The trades are converted to NumPy columns once, so each total is a masked
+    sum instead of a loop in the template.
+    
+    Args:
+        trades (list): Trade records
+        current_price (float): Current ETH price
+        
+    Returns:
+        dict: Holdings, investment, profit/loss, ROI and average prices
+    """
+    types = np.array([str(trade.get('type', '')).lower() for trade in trades])
+    prices = np.array([trade.get('price', 0) for trade in trades], dtype=float)
+    amounts = np.array([trade.get('amount', 0) for trade in trades], dtype=float)
+    buy_prices = np.array([trade.get('buy_price', np.nan) for trade in trades], dtype=float)
+    values = prices * amounts
+    
+    buys = types == 'buy'
+    sells = types == 'sell'
+    
+    # Anything that is not a buy reduces the holdings
+    eth_balance = amounts[buys].sum() - amounts[~buys].sum()
+    total_investment = values[buys].sum()
+    buy_amount = amounts[buys].sum()
+    sell_amount = amounts[sells].sum()
+    
+    # Realized P/L is only known for sales that record the price paid
+    realized = ~buys & ~np.isnan(buy_prices)
+    total_realized_pl = ((prices - buy_prices) * amounts)[realized].sum()
+    total_unrealized_pl = current_price * eth_balance - total_investment
+    
+    return {
+        'eth_balance': float(eth_balance),
+        'current_value': float(eth_balance * current_price),
+        'total_investment': float(total_investment),
+        'total_realized_pl': float(total_realized_pl),
+        'total_unrealized_pl': float(total_unrealized_pl),
+        'roi': float(total_unrealized_pl / total_investment * 100) if total_investment > 0 else 0.0,
+        'avg_buy_price': float(total_investment / buy_amount) if buy_amount > 0 else 0.0,
+        'avg_sell_price': float(values[sells].sum() / sell_amount) if sell_amount > 0 else 0.0
+    }
+
+def get_chart_series(historical_prices):
+    """
+    Collect the price and moving-average series for the client-side chart
+    
+    Args:
+        historical_prices (list): Price records with 'date', 'price' and optional 'ma50'/'ma200'
+        
+    Returns:
+        dict: Column lists keyed by series name, or None if the data is unusable
+    """
+    if not isinstance(historical_prices, list) or not historical_prices:
+        return None
+    
+    columns = set().union(*historical_prices)
+    if 'date' not in columns or 'price' not in columns:
+        logger.error("Historical prices data missing required columns")
+        return None
+    
+    series = {
+        'labels': [row.get('date') for row in historical_prices],
+        'price': [row.get('price') for row in historical_prices]
+    }
+    for column in ('ma50', 'ma200'):
+        if column in columns:
+            series[column] = [row.get(column) for row in historical_prices]
+    return series
+
+def m4_indices(values, bins):
+    """
+    Select the points of a series that determine its line plot (M4 downsampling)
+    
+    The series is split into `bins` consecutive groups and the first, last,
+    minimum and maximum point of each group is kept, which draws the same
+    pixels as the full series when each group maps to one pixel column.
+    
+    Args:
+        values (numpy.ndarray): Series values
+        bins (int): Number of groups, normally the plot width in pixels
+        
+    Returns:
+        numpy.ndarray: Sorted indices of the points to keep
+    """
+    edges = np.linspace(0, len(values), bins + 1).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+    
+    # Sorting by (group, value) puts each group's minimum first and maximum last
+    groups = np.repeat(np.arange(bins), ends - starts)
+    order = np.lexsort((values, groups))
+    return np.unique(np.concatenate([starts, ends - 1, order[starts], order[ends - 1]]))
+
 def generate_price_chart(historical_prices):
-    """Generate a price chart with technical indicators"""
+    """Render the price chart as an SVG image for browsers without JavaScript"""
     try:
-        # Convert to DataFrame if it's a list
+        # Matplotlib (and pandas, where needed) is imported here rather than at
+        # module level, so cold starts serving other pages do not load it
+        import matplotlib
+        from matplotlib.figure import Figure
+        
+        # Plot plain NumPy arrays, with the dates parsed once so the axis is a
+        # time axis rather than one category per date string
         if isinstance(historical_prices, list):
-            df = pd.DataFrame(historical_prices)
+            # Records from the analysis JSON go straight into arrays, without pandas
+            series = get_chart_series(historical_prices)
+            if series is None:
+                return None
+            try:
+                dates = np.array(series['labels'], dtype='datetime64[s]')
+            except ValueError:
+                # Not ISO 8601; let pandas work out the format
+                import pandas as pd
+                dates = pd.to_datetime(series['labels']).to_numpy()
+            columns = {name: np.array(series[name], dtype=float)
+                       for name in ('price', 'ma50', 'ma200') if name in series}
         else:
+            import pandas as pd
             df = historical_prices
             
-        # Ensure we have the required columns
-        if 'date' not in df.columns or 'price' not in df.columns:
-            logger.error("Historical prices data missing required columns")
-            return None
-            
-        # Create the figure and axis
-        fig, ax = plt.subplots(figsize=(10, 6))
+            # Ensure we have the required columns
+            if 'date' not in df.columns or 'price' not in df.columns:
+                logger.error("Historical prices data missing required columns")
+                return None
+            dates = pd.to_datetime(df['date']).to_numpy()
+            columns = {name: df[name].to_numpy(dtype=float)
+                       for name in ('price', 'ma50', 'ma200') if name in df.columns}
+        
+        # Long series are reduced to the points that are actually visible
+        if len(dates) > 4 * CHART_WIDTH_PX:
+            keep = m4_indices(columns['price'], CHART_WIDTH_PX)
+            dates = dates[keep]
+            columns = {name: values[keep] for name, values in columns.items()}
+        
+        # Create the figure and axis outside pyplot's global figure registry
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
         # Plot the price
-        ax.plot(df['date'], df['price'], label='ETH Price', color='#3498db')
+        ax.plot(dates, columns['price'], label='ETH Price', color='#3498db')
         
         # Add moving averages if available
-        if 'ma50' in df.columns:
-            ax.plot(df['date'], df['ma50'], label='50-day MA', color='#2ecc71', linestyle='--')
-        if 'ma200' in df.columns:
-            ax.plot(df['date'], df['ma200'], label='200-day MA', color='#e74c3c', linestyle='--')
+        if 'ma50' in columns:
+            ax.plot(dates, columns['ma50'], label='50-day MA', color='#2ecc71', linestyle='--')
+        if 'ma200' in columns:
+            ax.plot(dates, columns['ma200'], label='200-day MA', color='#e74c3c', linestyle='--')
             
         # Set labels and title
         ax.set_xlabel('Date')
@@ -174,32 +569,40 @@ def generate_price_chart(historical_prices):
         ax.legend()
         
         # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Tight layout
-        plt.tight_layout()
+        fig.tight_layout()
         
-        # Convert plot to base64 encoded image
+        # Render the plot to SVG bytes: vector output skips rasterization and
+        # is several times smaller than a PNG. Text stays as text instead of
+        # glyph paths, and with a fixed id salt and no timestamp the output
+        # is reproducible.
         buffer = io.BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
+        with matplotlib.rc_context({'svg.fonttype': 'none', 'svg.hashsalt': 'eth-price-chart'}):
+            fig.savefig(buffer, format='svg', metadata={'Date': None})
         
-        return image_base64
+        return buffer.getvalue()
     except Exception as e:
         logger.error(f"Error generating price chart: {e}")
         return None
 
+def log_publish_result(topic_path, future):
+    """Log the outcome of a background Pub/Sub publish"""
+    try:
+        message_id = future.result()
+        logger.info(f"Published message to {topic_path} with ID: {message_id}")
+    except Exception as e:
+        logger.error(f"Error publishing to {topic_path}: {e}")
+
 def trigger_analysis():
-    """Trigger a new ETH analysis via Pub/Sub"""
+    """Trigger a new ETH analysis via Pub/Sub without waiting for the publish to complete"""
     try:
         topic_path = publisher.topic_path(PROJECT_ID, 'run-eth-analysis')
         message = 'Run ETH investment analysis'
         data = message.encode('utf-8')
         future = publisher.publish(topic_path, data=data)
-        message_id = future.result()
-        logger.info(f"Published message to {topic_path} with ID: {message_id}")
+        future.add_done_callback(lambda f: log_publish_result(topic_path, f))
         return True
     except Exception as e:
         logger.error(f"Error triggering analysis: {e}")
@@ -208,70 +611,122 @@ def trigger_analysis():
 def record_trade(trade_type, price, amount, notes=""):
     """Record a new trade in Cloud Storage"""
     try:
-        bucket = storage_client.bucket(BUCKET_NAME)
-        trades_blob = bucket.blob('eth_trades.json')
-        
-        # Get existing trades
-        trades = []
-        if trades_blob.exists():
-            with tempfile.NamedTemporaryFile(mode='w+b', delete=False) as temp_file:
-                trades_blob.download_to_filename(temp_file.name)
-                with open(temp_file.name, 'r') as f:
-                    trades = json.load(f)
-                os.unlink(temp_file.name)
+        now = datetime.datetime.now()
+        price = float(price)
+        amount = float(amount)
+        if not (math.isfinite(price) and math.isfinite(amount) and price > 0 and amount > 0):
+            raise ValueError(f"Invalid trade price {price} or amount {amount}")
         
         # Create new trade
         new_trade = {
             'type': trade_type,
-            'price': float(price),
-            'amount': float(amount),
-            'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-            'timestamp': datetime.datetime.now().isoformat(),
+            'price': price,
+            'amount': amount,
+            'date': now.strftime('%Y-%m-%d'),
+            'timestamp': now.isoformat(),
             'notes': notes
         }
         
-        # Add to trades list
-        trades.append(new_trade)
-        
-        # Save updated trades
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-            json.dump(trades, temp_file)
-            temp_file.flush()
-            trades_blob.upload_from_filename(temp_file.name)
-            os.unlink(temp_file.name)
+        # Append it to today's shard, so only that day's trades are rewritten
+        bucket = storage_client.bucket(BUCKET_NAME)
+        shard_name = f"{TRADE_SHARD_PREFIX}{new_trade['date']}.jsonl"
+        line = json_dumps(new_trade) + b'\n'
+        for attempt in range(TRADE_WRITE_ATTEMPTS):
+            # Download without a separate existence check; the download
+            # also records the generation it read (0 = not created yet)
+            shard_blob = bucket.blob(shard_name)
+            try:
+                body = shard_blob.download_as_bytes()
+                generation = shard_blob.generation
+            except NotFound:
+                body, generation = b'', 0
             
-        return True
+            # Save updated shard, unless another writer changed it in between
+            try:
+                shard_blob.upload_from_string(body + line, content_type='application/x-ndjson',
+                                              if_generation_match=generation)
+                return True
+            except PreconditionFailed:
+                logger.warning(f"Trade shard {shard_name} changed while recording, retrying")
+        
+        raise RuntimeError(f"Trade shard {shard_name} kept changing; trade not recorded")
     except Exception as e:
         logger.error(f"Error recording trade: {e}")
         return False
 
+@app.after_request
+def compress_response(response):
+    """Gzip-compress large text responses when the client accepts gzip"""
+    # Streamed bodies would be drained by get_data(), so leave them alone
+    if (response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    # The encoding depends on the client, but the ETag does not: caches must
+    # key compressible responses on Accept-Encoding whether or not this one
+    # ends up compressed
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@app.before_request
+def require_login():
+    """Authenticate the request once, before any protected route runs"""
+    # Unmatched URLs (no endpoint) fall through to the 404 handler
+    if request.endpoint is None or request.endpoint in PUBLIC_ENDPOINTS:
+        return None
+    
+    if get_current_user() is None:
+        if request.path.startswith('/api/'):
+            return jsonify({'error': 'Unauthorized'}), 401
+        return redirect(url_for('login'))
+    return None
+
 # Routes
 @app.route('/')
 def index():
     """Main dashboard page"""
-    user = get_current_user()
-    if not user:
-        return redirect(url_for('login'))
-        
+    user = g.current_user
+    
     # Get latest analysis
     analysis = get_latest_analysis()
     
     # Get trade history
     trades = get_trade_history()
     
-    # Generate price chart if we have historical prices
-    price_chart = None
+    # The price chart is drawn in the browser from the raw series
+    price_chart_data = None
     if analysis and 'historical_prices' in analysis:
-        price_chart = generate_price_chart(analysis['historical_prices'])
+        price_chart_data = get_chart_series(analysis['historical_prices'])
     
     return render_template(
         'dashboard.html',
         user=user,
         analysis=analysis,
         trades=trades,
-        price_chart=price_chart
+        price_chart_data=price_chart_data
     )
 
+@app.route('/chart.svg')
+def price_chart_image():
+    """Server-rendered price chart, only requested by browsers without JavaScript"""
+    chart = get_latest_price_chart()
+    if chart is None:
+        return jsonify({'error': 'No chart data available'}), 404
+    
+    return app.response_class(chart, mimetype='image/svg+xml')
+
 @app.route('/login')
 def login():
     """Login page"""
@@ -289,8 +744,7 @@ def session_login():
     id_token = request.json.get('idToken')
     if id_token:
         try:
-            claims = google.oauth2.id_token.verify_firebase_token(
-                id_token, firebase_request_adapter)
+            claims = verify_id_token(id_token)
             session['id_token'] = id_token
             return jsonify({'success': True}), 200
         except ValueError as exc:
@@ -300,10 +754,8 @@ def session_login():
 @app.route('/history')
 def history():
     """Historical analysis page"""
-    user = get_current_user()
-    if not user:
-        return redirect(url_for('login'))
-        
+    user = g.current_user
+    
     # Get historical analyses
     analyses = get_historical_analyses()
     
@@ -316,33 +768,27 @@ def history():
 @app.route('/performance')
 def performance():
     """Performance tracking page"""
-    user = get_current_user()
-    if not user:
-        return redirect(url_for('login'))
-        
+    user = g.current_user
+    
     # Get trade history
     trades = get_trade_history()
     
-    # Get latest analysis for current price
-    analysis = get_latest_analysis()
-    current_price = 0
-    if analysis and 'price_data' in analysis and 'price' in analysis['price_data']:
-        current_price = analysis['price_data']['price']
+    # Get the current price without downloading the full analysis
+    current_price = get_current_price()
     
     return render_template(
         'performance.html',
         user=user,
         trades=trades,
-        current_price=current_price
+        current_price=current_price,
+        summary=summarize_trades(trades, current_price)
     )
 
 @app.route('/settings')
 def settings():
     """Settings page"""
-    user = get_current_user()
-    if not user:
-        return redirect(url_for('login'))
-        
+    user = g.current_user
+    
     return render_template(
         'settings.html',
         user=user
@@ -351,23 +797,19 @@ def settings():
 @app.route('/api/analysis/latest')
 def api_latest_analysis():
     """API endpoint for latest analysis"""
-    user = get_current_user()
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-        
-    analysis = get_latest_analysis()
-    if not analysis:
+    try:
+        latest_blob = find_latest_analysis_blob(storage_client.bucket(BUCKET_NAME))
+        if latest_blob is None:
+            return jsonify({'error': 'No analysis found'}), 404
+            
+        return conditional_json_response([latest_blob], lambda: load_blob_json(latest_blob))
+    except Exception as e:
+        logger.error(f"Error getting latest analysis: {e}")
         return jsonify({'error': 'No analysis found'}), 404
-        
-    return jsonify(analysis)
 
 @app.route('/api/analysis/trigger', methods=['POST'])
 def api_trigger_analysis():
     """API endpoint to trigger a new analysis"""
-    user = get_current_user()
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-        
     success = trigger_analysis()
     if not success:
         return jsonify({'error': 'Failed to trigger analysis'}), 500
@@ -377,20 +819,16 @@ def api_trigger_analysis():
 @app.route('/api/trades', methods=['GET'])
 def api_get_trades():
     """API endpoint to get trade history"""
-    user = get_current_user()
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-        
-    trades = get_trade_history()
-    return jsonify(trades)
+    try:
+        blobs = list_trade_blobs(storage_client.bucket(BUCKET_NAME))
+        return conditional_json_response(blobs, lambda: load_trades(blobs))
+    except Exception as e:
+        logger.error(f"Error getting trade history: {e}")
+        return json_response([])
 
 @app.route('/api/trades', methods=['POST'])
 def api_record_trade():
     """API endpoint to record a new trade"""
-    user = get_current_user()
-    if not user:
-        return jsonify({'error': 'Unauthorized'}), 401
-        
     data = request.json
     if not data or 'type' not in data or 'price' not in data or 'amount' not in data:
         return jsonify({'error': 'Missing required fields'}), 400
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+ETH Investment Dashboard - Web Application Tests
+------------------------------------------------
+This module tests the helpers of the App Engine web application in main.py.
+Google Cloud clients are replaced with mocks, so no credentials are needed.
+
+Author: Manus AI
+Date: April 16, 2025
+"""
+
+import gzip
+import types
+import numpy as np
+import unittest
+from unittest import mock
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+# main.py creates its Cloud clients at import time
+with mock.patch("google.cloud.storage.Client"), mock.patch("google.cloud.pubsub_v1.PublisherClient"):
+    import main
+
+class StubShardBucket:
+    """Bucket holding one trade shard, whose uploads fail a set number of times"""
+    
+    def __init__(self, body=None, generation=0, conflicts=0):
+        self.body = body
+        self.generation = generation
+        self.conflicts = conflicts
+        self.uploads = []
+    
+    def blob(self, name):
+        bucket = self
+        
+        class Blob:
+            generation = None
+            
+            def download_as_bytes(self):
+                if bucket.body is None:
+                    raise NotFound(name)
+                self.generation = bucket.generation
+                return bucket.body
+            
+            def upload_from_string(self, data, content_type=None, if_generation_match=None):
+                bucket.uploads.append((data, if_generation_match))
+                if bucket.conflicts:
+                    # Another writer got there first
+                    bucket.conflicts -= 1
+                    bucket.generation += 1
+                    raise PreconditionFailed(name)
+                bucket.body, bucket.generation = data, bucket.generation + 1
+                
+        return Blob()
+
+class ETHDashboardAppTest(unittest.TestCase):
+    """Test suite for the ETH dashboard web application"""
+    
+    def test_conditional_json_response(self):
+        """Test ETag revalidation of JSON API responses"""
+        print("\nTesting conditional JSON responses...")
+        
+        blobs = [types.SimpleNamespace(name="eth_trades.json", generation=42)]
+        load = mock.Mock(return_value={"trades": []})
+        
+        with main.app.test_request_context("/api/trades"):
+            response = main.conditional_json_response(blobs, load)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"trades": []})
+        etag = response.headers["ETag"]
+        
+        # A client holding the current ETag gets an empty 304 without a download
+        load.reset_mock()
+        with main.app.test_request_context("/api/trades", headers={"If-None-Match": etag}):
+            response = main.conditional_json_response(blobs, load)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(response.headers["ETag"], etag)
+        load.assert_not_called()
+        
+        # A new generation of the blob changes the ETag
+        blobs[0].generation = 43
+        with main.app.test_request_context("/api/trades", headers={"If-None-Match": etag}):
+            response = main.conditional_json_response(blobs, load)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        
+        print("Conditional JSON response tests passed")
+    
+    def test_compress_response(self):
+        """Test gzip compression and Vary headers of text responses"""
+        print("\nTesting response compression...")
+        
+        large_body = b'{"prices": [' + b"2000.0, " * 200 + b"2000.0]}"
+        
+        # Large JSON is compressed for gzip clients
+        with main.app.test_request_context("/", headers={"Accept-Encoding": "gzip, deflate"}):
+            response = main.compress_response(main.app.response_class(large_body, mimetype="application/json"))
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.get_data()), large_body)
+        self.assertIn("Accept-Encoding", response.vary)
+        
+        # Uncompressed variants of compressible responses still vary on Accept-Encoding
+        for body, accept_encoding in ((b"{}", "gzip"), (large_body, "identity")):
+            with main.app.test_request_context("/", headers={"Accept-Encoding": accept_encoding}):
+                response = main.compress_response(main.app.response_class(body, mimetype="application/json"))
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertEqual(response.get_data(), body)
+            self.assertIn("Accept-Encoding", response.vary)
+            
+        # Streamed responses are passed through without draining the generator
+        consumed = []
+        
+        def stream():
+            consumed.append(True)
+            yield large_body
+            
+        with main.app.test_request_context("/", headers={"Accept-Encoding": "gzip"}):
+            response = main.compress_response(main.app.response_class(stream(), mimetype="text/html"))
+        self.assertTrue(response.is_streamed)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(consumed, [], "Streamed body should not be read")
+        
+        print("Response compression tests passed")
+    
+    def test_summarize_trades(self):
+        """Test the performance page totals"""
+        print("\nTesting trade summary...")
+        
+        trades = [
+            {"type": "buy", "price": 1000, "amount": 1.0},
+            {"type": "BUY", "price": 1500, "amount": 2.0},
+            {"type": "sell", "price": 2000, "amount": 1.0, "buy_price": 1000}
+        ]
+        summary = main.summarize_trades(trades, current_price=2500)
+        
+        self.assertAlmostEqual(summary["eth_balance"], 2.0)
+        self.assertAlmostEqual(summary["current_value"], 5000.0)
+        self.assertAlmostEqual(summary["total_investment"], 4000.0)
+        self.assertAlmostEqual(summary["total_realized_pl"], 1000.0)
+        self.assertAlmostEqual(summary["total_unrealized_pl"], 1000.0)
+        self.assertAlmostEqual(summary["roi"], 25.0)
+        self.assertAlmostEqual(summary["avg_buy_price"], 4000.0 / 3)
+        self.assertAlmostEqual(summary["avg_sell_price"], 2000.0)
+        
+        # No trades gives zero totals rather than NaN
+        empty = main.summarize_trades([], current_price=2500)
+        for key, value in empty.items():
+            self.assertEqual(value, 0.0, f"{key} should be 0 without trades")
+            
+        print("Trade summary tests passed")
+    
+    def test_record_trade_retries(self):
+        """Test that trade appends retry on a generation conflict and then give up"""
+        print("\nTesting trade recording retries...")
+        
+        # The first write loses a race; the retry re-reads and appends to the new generation
+        bucket = StubShardBucket(body=b'{"type": "buy"}\n', generation=5, conflicts=1)
+        with mock.patch.object(main.storage_client, "bucket", return_value=bucket):
+            self.assertTrue(main.record_trade("sell", 2000, 0.5, "Test"))
+        self.assertEqual([generation for _, generation in bucket.uploads], [5, 6])
+        lines = bucket.body.splitlines()
+        self.assertEqual(len(lines), 2, "Trade should be appended to the existing shard")
+        self.assertEqual(main.json_loads(lines[1])["type"], "sell")
+        
+        # A shard that does not exist yet must still not exist when written
+        bucket = StubShardBucket()
+        with mock.patch.object(main.storage_client, "bucket", return_value=bucket):
+            self.assertTrue(main.record_trade("buy", 2000, 1.0))
+        self.assertEqual(bucket.uploads[0][1], 0)
+        
+        # Writers that keep winning exhaust the attempts
+        bucket = StubShardBucket(body=b"", generation=1, conflicts=main.TRADE_WRITE_ATTEMPTS + 1)
+        with mock.patch.object(main.storage_client, "bucket", return_value=bucket):
+            self.assertFalse(main.record_trade("buy", 2000, 1.0))
+        self.assertEqual(len(bucket.uploads), main.TRADE_WRITE_ATTEMPTS)
+        
+        print("Trade recording retry tests passed")
+    
+    def test_m4_indices(self):
+        """Test that M4 downsampling keeps the extremes of every bucket"""
+        print("\nTesting M4 downsampling...")
+        
+        values = 2000 + np.cumsum(np.random.default_rng(9).normal(0, 25, 1003))
+        bins = 37
+        indices = main.m4_indices(values, bins)
+        
+        self.assertTrue(np.all(np.diff(indices) > 0), "Indices should be sorted and unique")
+        self.assertLessEqual(len(indices), 4 * bins)
+        
+        kept = set(indices.tolist())
+        edges = np.linspace(0, len(values), bins + 1).astype(int)
+        for start, end in zip(edges[:-1], edges[1:]):
+            bucket = values[start:end]
+            self.assertIn(start, kept, "First point of each bucket should be kept")
+            self.assertIn(end - 1, kept, "Last point of each bucket should be kept")
+            self.assertIn(start + int(bucket.argmin()), kept, "Bucket minimum should be kept")
+            self.assertIn(start + int(bucket.argmax()), kept, "Bucket maximum should be kept")
+        
+        print("M4 downsampling tests passed")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,492 @@
+import base64
+import gzip
+import os
+import traceback
+import google.auth
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import NotFound
+from google.cloud import storage
+from datetime import datetime
+
+# Import our ETH investment modules
+# Note: These need to be included in the deployment package
+from eth_price_tracker import ETHPriceTracker
+from eth_technical_analysis import ETHTechnicalAnalysis
+from eth_investment_advisor import ETHInvestmentAdvisor
+from eth_risk_manager import ETHRiskManager
+from eth_performance_tracker import ETHPerformanceTracker
+
+# Configuration
+BUCKET_NAME = os.environ.get('STORAGE_BUCKET', 'eth-investment-data')
+CONFIG_FILE = os.environ.get('CONFIG_FILE', 'eth_config.json')
+NOTIFICATION_TOPIC = os.environ.get('NOTIFICATION_TOPIC', 'eth-investment-notifications')
+GZIP_MIN_BYTES = 4096
+# Copy of the newest analysis, read by the dashboard without listing the bucket
+LATEST_ANALYSIS_FILE = 'eth_latest_analysis.json'
+# Just the current price, for dashboard pages that need nothing else from the analysis
+CURRENT_PRICE_FILE = 'eth_current_price.json'
+# Trades recorded by the dashboard: the original JSON array plus one JSON Lines shard per day
+TRADES_FILE = 'eth_trades.json'
+TRADE_SHARD_PREFIX = 'eth_trades/'
+
+# Credentials, project and storage client shared by all invocations in this container
+_credentials = None
+_project = None
+_bucket = None
+
+def get_credentials():
+    """
+    Resolve the default credentials and project once
+    
+    Passing the result to every client stops each of them from repeating
+    the discovery against the metadata server. GOOGLE_CLOUD_PROJECT is set
+    at deploy time, so the project is read from the environment.
+    
+    Returns:
+        tuple: (google.auth.credentials.Credentials, project ID)
+    """
+    global _credentials, _project
+    if _credentials is None:
+        _credentials, _project = google.auth.default()
+        _project = _project or os.environ.get('PROJECT_ID')
+    return _credentials, _project
+
+def get_bucket():
+    """
+    Get the storage bucket handle, creating the client once
+    
+    Creating the client runs credential discovery, so a warm container
+    reuses the same client instead of paying for it on every invocation.
+    
+    Returns:
+        google.cloud.storage.Bucket: Bucket for the analysis data
+    """
+    global _bucket
+    if _bucket is None:
+        credentials, project = get_credentials()
+        _bucket = storage.Client(project=project, credentials=credentials).bucket(BUCKET_NAME)
+    return _bucket
+
+def dumps_json(data):
+    """
+    Serialize data straight to UTF-8 JSON bytes
+    
+    orjson skips the intermediate str that json.dumps(...).encode() builds
+    and handles NumPy arrays and scalars that leak into the results.
+    
+    Args:
+        data: JSON-serializable content
+    
+    Returns:
+        bytes: Encoded JSON document
+    """
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def load_json_blob(bucket, blob_name, default):
+    """
+    Download and parse a JSON blob from the bucket
+    
+    Args:
+        bucket (google.cloud.storage.Bucket): Bucket to read from
+        blob_name (str): Name of the JSON blob
+        default: Value returned when the blob does not exist
+    
+    Returns:
+        Parsed JSON content, or default
+    """
+    try:
+        return orjson.loads(bucket.blob(blob_name).download_as_bytes())
+    except NotFound:
+        return default
+
+def load_trade_history(bucket):
+    """
+    Load all recorded trades in order
+    
+    Args:
+        bucket (google.cloud.storage.Bucket): Bucket to read from
+    
+    Returns:
+        list: Trades from eth_trades.json followed by the daily shards
+    """
+    trades = load_json_blob(bucket, TRADES_FILE, [])
+    for shard in bucket.list_blobs(prefix=TRADE_SHARD_PREFIX):
+        trades.extend(orjson.loads(line) for line in shard.download_as_bytes().splitlines() if line.strip())
+    return trades
+
+def upload_blob(blob, body, content_type):
+    """
+    Upload bytes to a blob, gzip-encoding payloads above GZIP_MIN_BYTES
+    
+    Cloud Storage keeps the compressed bytes and decompresses them again
+    for readers, so download_as_bytes still returns the original content.
+    
+    Args:
+        blob (google.cloud.storage.Blob): Blob to write
+        body (bytes): Payload to upload
+        content_type (str): MIME type of the uncompressed payload
+    """
+    if len(body) >= GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=6)
+        blob.content_encoding = 'gzip'
+    else:
+        blob.content_encoding = None
+    blob.upload_from_string(body, content_type=content_type)
+
+def save_json_blob(blob, data):
+    """
+    Serialize data as JSON and upload it to a blob
+    
+    Args:
+        blob (google.cloud.storage.Blob): Blob to write
+        data: JSON-serializable content
+    """
+    upload_blob(blob, dumps_json(data), 'application/json')
+
+def run_eth_analysis(event, context):
+    """
+    Cloud Function to run ETH investment analysis
+    
+    Args:
+        event (dict): Event payload
+        context (google.cloud.functions.Context): Event context
+    
+    Returns:
+        dict: Analysis results
+    """
+    try:
+        print(f"Starting ETH investment analysis at {datetime.now().isoformat()}")
+        
+        # Storage bucket handle, shared with earlier invocations in this container
+        bucket = get_bucket()
+        
+        # Download configuration, trade history and decision history in
+        # parallel; each is an independent round-trip to Cloud Storage
+        decisions_file = 'eth_decisions.json'
+        decisions_blob = bucket.blob(decisions_file)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            config_future = executor.submit(load_json_blob, bucket, CONFIG_FILE, {})
+            trades_future = executor.submit(load_trade_history, bucket)
+            decisions_future = executor.submit(load_json_blob, bucket, decisions_file, [])
+            config = config_future.result()
+            trades_data = trades_future.result()
+            decisions_data = decisions_future.result()
+        
+        # Initialize modules
+        price_tracker = ETHPriceTracker()
+        analyzer = ETHTechnicalAnalysis()
+        advisor = ETHInvestmentAdvisor(risk_tolerance=config.get('risk_tolerance', 'medium'))
+        risk_manager = ETHRiskManager(
+            portfolio_value=config.get('portfolio_value', 10000),
+            max_risk_per_trade=config.get('max_risk_per_trade', 0.02),
+            max_portfolio_exposure=config.get('max_portfolio_exposure', 0.25)
+        )
+        
+        # Initialize performance tracker with loaded data
+        performance_tracker = ETHPerformanceTracker()
+        performance_tracker.trades = trades_data
+        performance_tracker.decisions = decisions_data
+        
+        # Get current price data
+        current_data = price_tracker.get_current_price()
+        if not current_data:
+            raise Exception("Failed to get current price data")
+            
+        current_price = current_data.get('price', 0)
+        print(f"Current ETH Price: ${current_price:.2f}")
+        
+        # Get historical price data
+        historical_prices = price_tracker.get_historical_prices(days=90)
+        if historical_prices.empty:
+            raise Exception("Failed to get historical price data")
+            
+        print(f"Retrieved {len(historical_prices)} days of historical data")
+        
+        # Perform technical analysis
+        analysis_results = analyzer.analyze_price_data(historical_prices)
+        if not analysis_results:
+            raise Exception("Failed to perform technical analysis")
+            
+        print(f"Technical Analysis Recommendation: {analysis_results.get('recommendation', 'UNKNOWN')}")
+        
+        # Generate investment recommendation
+        recommendation = advisor.generate_recommendation(analysis_results, historical_prices)
+        if not recommendation:
+            raise Exception("Failed to generate investment recommendation")
+            
+        print(f"Investment Recommendation: {recommendation.get('recommendation', 'UNKNOWN')}")
+        
+        # Generate risk management report
+        risk_report = risk_manager.generate_risk_report(current_price, current_price, historical_prices)
+        if not risk_report:
+            raise Exception("Failed to generate risk management report")
+        
+        # Generate performance report
+        performance_report = performance_tracker.generate_performance_report(current_price)
+        if not performance_report:
+            raise Exception("Failed to generate performance report")
+        
+        # Record the decision
+        decision = performance_tracker.record_decision(
+            recommendation.get('recommendation', 'UNKNOWN'),
+            current_price,
+            analysis_results
+        )
+        
+        # Compile results
+        results = {
+            'timestamp': datetime.now().isoformat(),
+            'price_data': current_data,
+            'analysis': analysis_results,
+            'recommendation': recommendation,
+            'risk_report': risk_report,
+            'performance': performance_report
+        }
+        
+        # Generate beginner-friendly summary
+        summary = generate_beginner_friendly_summary(results)
+        
+        # Save updated decisions, results (dated and latest copy), current
+        # price and summary to storage in parallel
+        date_suffix = datetime.now().strftime("%Y%m%d")
+        summary_blob = bucket.blob(f'eth_summary_{date_suffix}.txt')
+        results_body = dumps_json(results)
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            upload_futures = [
+                executor.submit(save_json_blob, decisions_blob, performance_tracker.decisions),
+                executor.submit(upload_blob, bucket.blob(f'eth_analysis_{date_suffix}.json'), results_body, 'application/json'),
+                executor.submit(upload_blob, bucket.blob(LATEST_ANALYSIS_FILE), results_body, 'application/json'),
+                executor.submit(save_json_blob, bucket.blob(CURRENT_PRICE_FILE), {'price': current_data.get('price')}),
+                executor.submit(upload_blob, summary_blob, summary.encode('utf-8'), 'text/plain')
+            ]
+            for future in upload_futures:
+                future.result()
+        
+        # Send notification (implementation depends on your notification method)
+        send_notification(
+            subject=f"ETH Analysis: {recommendation.get('recommendation', 'UNKNOWN')}",
+            message=summary,
+            results=results
+        )
+        
+        print(f"ETH investment analysis completed successfully at {datetime.now().isoformat()}")
+        return results
+        
+    except Exception as e:
+        error_message = f"Error in ETH analysis: {str(e)}\n{traceback.format_exc()}"
+        print(error_message)
+        
+        # Send error notification
+        try:
+            send_notification(
+                subject="ETH Analysis Error",
+                message=error_message,
+                results=None
+            )
+        except Exception as notify_error:
+            print(f"Failed to send error notification: {str(notify_error)}")
+        
+        # Re-raise the exception for Cloud Functions logging
+        raise
+
+def generate_beginner_friendly_summary(results):
+    """Generate a beginner-friendly summary of analysis results"""
+    try:
+        if not results:
+            return "Error: No analysis results available"
+            
+        summary = []
+        
+        # Add header
+        summary.append("=" * 60)
+        summary.append("ETH INVESTMENT SUMMARY - BEGINNER'S GUIDE")
+        summary.append("=" * 60)
+        summary.append("")
+        
+        # Add current price information
+        if "price_data" in results:
+            price_data = results["price_data"]
+            summary.append(f"Current ETH Price: ${price_data.get('price', 0):.2f}")
+            
+            change_24h = price_data.get('change_24h', 0)
+            if change_24h > 0:
+                summary.append(f"24-hour Change: 📈 +{change_24h:.2f}% (Up)")
+            else:
+                summary.append(f"24-hour Change: 📉 {change_24h:.2f}% (Down)")
+                
+            summary.append("")
+        
+        # Add recommendation
+        if "recommendation" in results:
+            recommendation = results["recommendation"]
+            rec_text = recommendation.get("recommendation", "UNKNOWN")
+            
+            summary.append("WHAT SHOULD YOU DO?")
+            summary.append("-" * 60)
+            
+            if rec_text == "STRONG BUY":
+                summary.append("🟢 STRONG BUY - Technical indicators strongly suggest buying ETH now")
+            elif rec_text == "BUY":
+                summary.append("🟢 BUY - Technical indicators suggest buying ETH now")
+            elif rec_text == "HOLD":
+                summary.append("🟡 HOLD - Technical indicators suggest holding your current position")
+            elif rec_text == "SELL":
+                summary.append("🔴 SELL - Technical indicators suggest selling ETH now")
+            elif rec_text == "STRONG SELL":
+                summary.append("🔴 STRONG SELL - Technical indicators strongly suggest selling ETH now")
+            else:
+                summary.append(f"⚪ {rec_text} - Please check the detailed analysis")
+            
+            summary.append("")
+            summary.append("Recommended Action:")
+            summary.append(recommendation.get("action", "No specific action recommended"))
+            summary.append("")
+            
+            # Add explanation in simple terms
+            summary.append("WHY THIS RECOMMENDATION?")
+            summary.append("-" * 60)
+            
+            for explanation in recommendation.get("explanations", []):
+                if explanation:
+                    summary.append(f"• {explanation}")
+            
+            summary.append("")
+        
+        # Add risk management in simple terms
+        if "risk_report" in results:
+            risk_report = results["risk_report"]
+            
+            summary.append("RISK MANAGEMENT")
+            summary.append("-" * 60)
+            
+            # Stop-loss
+            if "stop_loss" in risk_report:
+                stop_loss = risk_report["stop_loss"]
+                recommended_method = stop_loss.get("recommended_method", "")
+                
+                if recommended_method and recommended_method in stop_loss.get("methods", {}):
+                    stop_price = stop_loss["methods"][recommended_method].get("stop_price", 0)
+                    
+                    summary.append(f"Stop-Loss Price: ${stop_price:.2f}")
+                    summary.append("(This is the price at which you should sell to limit potential losses)")
+                    summary.append("")
+            
+            # Position size
+            if "position_size" in risk_report:
+                position_size = risk_report["position_size"]
+                
+                summary.append("If you decide to buy ETH:")
+                summary.append(f"• Recommended Amount: {position_size.get('position_size_coins', 0):.4f} ETH")
+                summary.append(f"• Approximate Cost: ${position_size.get('position_size_dollars', 0):.2f}")
+                summary.append(f"• This represents {position_size.get('portfolio_percentage', 0) * 100:.1f}% of your portfolio")
+                summary.append("")
+        
+        # Add performance summary
+        if "performance" in results and "portfolio" in results["performance"]:
+            portfolio = results["performance"]["portfolio"]
+            
+            summary.append("YOUR PORTFOLIO PERFORMANCE")
+            summary.append("-" * 60)
+            
+            eth_balance = portfolio.get('eth_balance', 0)
+            if eth_balance > 0:
+                summary.append(f"Current ETH Holdings: {eth_balance:.4f} ETH (${portfolio.get('current_value', 0):.2f})")
+                
+                total_pl = portfolio.get('total_pl', 0)
+                roi = portfolio.get('roi', 0) * 100
+                
+                if total_pl >= 0:
+                    summary.append(f"Total Profit: ${total_pl:.2f} (ROI: {roi:.1f}%)")
+                else:
+                    summary.append(f"Total Loss: ${total_pl:.2f} (ROI: {roi:.1f}%)")
+            else:
+                summary.append("You don't have any ETH holdings recorded yet.")
+                summary.append("Use this tool to track your investments once you start buying ETH.")
+            
+            summary.append("")
+        
+        # Add footer with next steps
+        summary.append("NEXT STEPS")
+        summary.append("-" * 60)
+        summary.append("1. Review the recommendation and decide if you want to take action")
+        summary.append("2. If buying, consider using the recommended position size")
+        summary.append("3. If selling, consider the tax implications of your sale")
+        summary.append("4. Always set a stop-loss to protect your investment")
+        summary.append("5. Check back next week for an updated analysis")
+        summary.append("")
+        
+        # Add disclaimer
+        summary.append("DISCLAIMER")
+        summary.append("-" * 60)
+        summary.append("This is an automated analysis based on technical indicators.")
+        summary.append("It should not be considered financial advice.")
+        summary.append("Always do your own research before making investment decisions.")
+        summary.append("=" * 60)
+        
+        return "\n".join(summary)
+    except Exception as e:
+        print(f"Error generating beginner-friendly summary: {str(e)}")
+        return f"Error generating summary: {str(e)}"
+
+# Pub/Sub publisher shared by all invocations in this container
+_publisher = None
+_topic_path = None
+
+def get_publisher():
+    """
+    Get the Pub/Sub publisher and notification topic path, creating them once
+    
+    Creating the client resolves credentials, which is far slower than a
+    publish, so a warm container reuses the same client.
+    
+    Returns:
+        tuple: (PublisherClient, topic path)
+    """
+    global _publisher, _topic_path
+    if _publisher is None:
+        from google.cloud import pubsub_v1
+        
+        credentials, project = get_credentials()
+        _publisher = pubsub_v1.PublisherClient(
+            batch_settings=pubsub_v1.types.BatchSettings(max_messages=10, max_latency=0.05),
+            credentials=credentials
+        )
+        _topic_path = _publisher.topic_path(project or 'your-project-id', NOTIFICATION_TOPIC)
+    return _publisher, _topic_path
+
+def send_notification(subject, message, results=None):
+    """
+    Send notification with analysis results
+    
+    This is a placeholder function. Implement your preferred notification method:
+    - Pub/Sub
+    - SendGrid
+    - SMTP email
+    - Twilio SMS
+    - etc.
+    """
+    # Example using Pub/Sub (you would need to set up a Pub/Sub topic and subscriber)
+    try:
+        publisher, topic_path = get_publisher()
+        
+        # Create message data
+        data = {
+            'subject': subject,
+            'message': message,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        # Add results if available
+        if results:
+            data['results'] = results
+        
+        # Convert to JSON and publish; wait for delivery because background
+        # publishing stalls once the function has returned
+        publisher.publish(topic_path, data=dumps_json(data)).result()
+        
+        print(f"Notification sent to topic: {NOTIFICATION_TOPIC}")
+        return True
+    except Exception as e:
+        print(f"Error sending notification: {str(e)}")
+        return False
@@ -0,0 +1,162 @@
+#!/bin/bash
+# Startup script for ETH investment VM
+
+# Update system packages
+apt-get update
+apt-get upgrade -y
+
+# Install required packages
+apt-get install -y python3-pip python3-venv git
+
+# Create directory for the script
+mkdir -p /opt/eth-investment
+
+# Clone the repository or download files
+# git clone YOUR_REPO_URL /opt/eth-investment
+# OR
+# Create script files
+
+# Create virtual environment
+python3 -m venv /opt/eth-investment/venv
+source /opt/eth-investment/venv/bin/activate
+
+# Install required Python packages
+pip install pandas numpy matplotlib gspread oauth2client requests
+
+# Precompile the scripts and installed packages, and import the heavy packages
+# once to warm the page cache, so scheduled runs start faster
+python -m compileall -q /opt/eth-investment
+python -c "import pandas, numpy, matplotlib"
+
+# Spread scheduled runs of different VMs over 9:00-9:14 so they do not all hit
+# the price API at the same moment
+CRON_MINUTE=$(( RANDOM % 15 ))
+
+# Set up cron job for weekly analysis. flock skips a run while the previous one
+# still holds the lock (exit code 75), and the skip is logged separately.
+(crontab -l 2>/dev/null; echo "$CRON_MINUTE 9 * * 1 flock -n -E 75 /var/lock/eth-analysis.lock -c 'cd /opt/eth-investment && /opt/eth-investment/venv/bin/python eth_investment_dashboard.py --run >> /var/log/eth-analysis.log 2>&1'; [ \$? -ne 75 ] || echo 'eth-analysis skipped: lock held' >> /var/log/eth-skip.log") | crontab -
+
+# Set up log rotation
+cat > /etc/logrotate.d/eth-investment << 'EOL'
+/var/log/eth-analysis.log {
+    weekly
+    rotate 12
+    compress
+    delaycompress
+    missingok
+    notifempty
+    create 0640 root root
+}
+EOL
+
+# Create the helper scripts. The heredoc delimiters are quoted so nothing in
+# them is expanded now; variables and commands are evaluated when they run.
+# Create notification script
+cat > /opt/eth-investment/send_notification.py << 'EOL'
+#!/usr/bin/env python3
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+import os
+import sys
+
+def send_email_notification(subject, body, recipient):
+    # Email configuration - replace with your values or use environment variables
+    sender = os.environ.get("NOTIFICATION_EMAIL", "your-email@gmail.com")
+    password = os.environ.get("NOTIFICATION_PASSWORD", "your-app-password")
+    
+    # Create message
+    message = MIMEMultipart()
+    message["From"] = sender
+    message["To"] = recipient
+    message["Subject"] = subject
+    
+    # Add body
+    message.attach(MIMEText(body, "plain"))
+    
+    # Send email
+    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
+        server.login(sender, password)
+        server.send_message(message)
+        
+    print(f"Email notification sent to {recipient}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python send_notification.py subject body recipient")
+        sys.exit(1)
+        
+    subject = sys.argv[1]
+    body = sys.argv[2]
+    recipient = sys.argv[3]
+    
+    send_email_notification(subject, body, recipient)
+EOL
+
+chmod +x /opt/eth-investment/send_notification.py
+
+# Create a wrapper script to run analysis and send notification
+cat > /opt/eth-investment/run_analysis_with_notification.sh << 'EOL'
+#!/bin/bash
+# NOTIFICATION_RECIPIENT is read from the environment each time this runs
+cd /opt/eth-investment
+source venv/bin/activate
+if python eth_investment_dashboard.py --run > analysis_output.txt; then
+    python send_notification.py "ETH Analysis Complete" "$(cat analysis_output.txt)" "$NOTIFICATION_RECIPIENT"
+else
+    python send_notification.py "ETH Analysis Failed" "The ETH investment analysis script failed to run properly." "$NOTIFICATION_RECIPIENT"
+fi
+EOL
+
+chmod +x /opt/eth-investment/run_analysis_with_notification.sh
+
+# Create a health check script
+cat > /opt/eth-investment/health_check.py << 'EOL'
+#!/usr/bin/env python3
+import os
+import time
+import datetime
+import sys
+
+def check_log_file(log_file, max_age_hours=25):
+    """Check if log file exists and has been updated recently"""
+    if not os.path.exists(log_file):
+        return False, "Log file does not exist"
+        
+    file_mod_time = os.path.getmtime(log_file)
+    current_time = time.time()
+    age_hours = (current_time - file_mod_time) / 3600
+    
+    if age_hours > max_age_hours:
+        return False, f"Log file is too old: {age_hours:.1f} hours"
+    
+    return True, f"Log file is recent: {age_hours:.1f} hours old"
+
+if __name__ == "__main__":
+    log_file = "/var/log/eth-analysis.log"
+    
+    # Check if script should have run recently (e.g., after Monday 9 AM)
+    today = datetime.datetime.now()
+    day_of_week = today.weekday()  # 0 is Monday
+    hour = today.hour
+    
+    # If it's Monday after 9 AM or any later day in the week, log should be fresh
+    should_have_run = (day_of_week == 0 and hour >= 9) or day_of_week > 0
+    
+    if should_have_run:
+        status, message = check_log_file(log_file)
+        print(message)
+        if not status:
+            sys.exit(1)
+    else:
+        print("No recent run expected yet")
+        
+    sys.exit(0)
+EOL
+
+chmod +x /opt/eth-investment/health_check.py
+
+# Set up a daily health check, guarded by its own lock in the same way
+(crontab -l 2>/dev/null; echo "0 12 * * * flock -n -E 75 /var/lock/eth-health-check.lock -c \"cd /opt/eth-investment && ./health_check.py || ./send_notification.py 'ETH Script Health Check Failed' 'The ETH investment script health check failed. Please check the VM.' \\\"\$NOTIFICATION_RECIPIENT\\\"\"; [ \$? -ne 75 ] || echo 'eth-health-check skipped: lock held' >> /var/log/eth-skip.log") | crontab -
+
+echo "ETH investment script setup complete"